@@ -0,0 +1,147 @@
+# ================================================
+# 🏫 Cohort Analytics Aggregates
+# ================================================
+# Department / gender / income-band risk distributions for the whole
+# cohort, kept as one-percent-wide histograms per group. Everything shown
+# on the analytics panel (counts, mean, quantiles, at-risk counts) is
+# derived from those small tables, so a rerun never touches the 20k rows.
+# When the risk table changes only the changed students are moved between
+# bins; a different student set triggers a rebuild.
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from scoring import ID_COL, RISK_LEVELS
+
+
+RISK_BINS = np.linspace(0, 100, 101)
+INCOME_BANDS = [-np.inf, 25_000, 50_000, 75_000, 100_000, np.inf]
+INCOME_LABELS = ["< ₹25k", "₹25k–50k", "₹50k–75k", "₹75k–1L", "≥ ₹1L"]
+DIMENSIONS = {
+    "department": "Department",
+    "gender": "Gender",
+    "income_band": "Income Band",
+}
+
+
+def _bin_of(risk):
+    return np.clip(np.asarray(risk, dtype=float).astype(int), 0, len(RISK_BINS) - 2)
+
+
+def group_codes(df):
+    """{dimension: (codes per student, group labels)}."""
+    income = pd.cut(df["family_income"].astype(float), INCOME_BANDS, labels=INCOME_LABELS, right=False)
+    out = {}
+    for dim, values in (("department", df["department"]), ("gender", df["gender"]), ("income_band", income)):
+        cat = pd.Categorical(values.astype(str) if dim != "income_band" else values)
+        out[dim] = (cat.codes.astype(np.int64), [str(c) for c in cat.categories])
+    return out
+
+
+class CohortAggregates:
+    """Per-group risk histograms with incremental updates."""
+
+    def __init__(self, df, risk, version=None):
+        self.version = version
+        self.ids = df[ID_COL].to_numpy()
+        self.risk = np.asarray(risk, dtype=float).copy()
+        self.bins = _bin_of(self.risk)
+        self.codes = {}
+        self.labels = {}
+        self.hist = {}
+        self.sums = {}
+        n_bins = len(RISK_BINS) - 1
+        for dim, (codes, labels) in group_codes(df).items():
+            self.codes[dim] = codes
+            self.labels[dim] = labels
+            # Unknown income (code -1) lands in an extra, unlabeled row
+            hist = np.zeros((len(labels) + 1, n_bins), dtype=np.int64)
+            np.add.at(hist, (codes, self.bins), 1)
+            self.hist[dim] = hist
+            self.sums[dim] = np.bincount(codes + 1, weights=self.risk, minlength=len(labels) + 1)[1:]
+        self._lock = threading.Lock()
+
+    def same_students(self, df):
+        return len(df) == len(self.ids) and np.array_equal(df[ID_COL].to_numpy(), self.ids)
+
+    def update(self, positions, new_risk):
+        """Move students (row positions) to their new risk bins."""
+        positions = np.asarray(positions, dtype=np.int64)
+        new_risk = np.asarray(new_risk, dtype=float)
+        new_bins = _bin_of(new_risk)
+        with self._lock:
+            old_bins = self.bins[positions]
+            for dim, hist in self.hist.items():
+                codes = self.codes[dim][positions]
+                np.subtract.at(hist, (codes, old_bins), 1)
+                np.add.at(hist, (codes, new_bins), 1)
+                valid = codes >= 0
+                np.add.at(self.sums[dim], codes[valid], new_risk[valid] - self.risk[positions][valid])
+            self.bins[positions] = new_bins
+            self.risk[positions] = new_risk
+        return len(positions)
+
+    def sync(self, risk, version):
+        """Apply a new risk table for the same students; returns rows changed."""
+        risk = np.asarray(risk, dtype=float)
+        changed = np.flatnonzero(risk != self.risk)
+        self.update(changed, risk[changed])
+        self.version = version
+        return len(changed)
+
+    # === Views ===
+    def table(self, dim):
+        """One row per group: students, mean, quantiles and risk-band counts."""
+        with self._lock:
+            hist = self.hist[dim][:len(self.labels[dim])].copy()
+            sums = self.sums[dim].copy()
+        counts = hist.sum(axis=1)
+        cum = hist.cumsum(axis=1)
+        table = pd.DataFrame({
+            DIMENSIONS[dim]: self.labels[dim],
+            "Students": counts,
+            "Mean Risk (%)": np.divide(sums, counts, out=np.zeros(len(counts)), where=counts > 0),
+        })
+        for q in (0.5, 0.9):
+            # Upper edge of the bin holding the q-quantile (1% resolution)
+            idx = (cum < np.ceil(q * counts)[:, None]).sum(axis=1).clip(0, hist.shape[1] - 1)
+            table[f"P{int(q * 100)} Risk (%)"] = np.where(counts > 0, RISK_BINS[idx + 1], np.nan)
+        low, moderate = hist[:, :30].sum(axis=1), hist[:, 30:60].sum(axis=1)
+        table[RISK_LEVELS[0]] = low
+        table[RISK_LEVELS[1]] = moderate
+        table[RISK_LEVELS[2]] = counts - low - moderate
+        table["High Risk Share"] = np.divide(table[RISK_LEVELS[2]], counts, out=np.zeros(len(counts)),
+                                             where=counts > 0)
+        return table
+
+    def histogram(self, dim, group=None, width=5):
+        """Risk histogram (bin start -> students), optionally for one group."""
+        with self._lock:
+            hist = self.hist[dim]
+            row = hist.sum(axis=0) if group is None else hist[self.labels[dim].index(group)].copy()
+        coarse = row.reshape(-1, width).sum(axis=1)
+        return pd.Series(coarse, index=RISK_BINS[:-1:width].astype(int), name="Students")
+
+    def members(self, dim, group, level=None, limit=None):
+        """student_ids in a group (optionally one risk band), riskiest first."""
+        with self._lock:
+            mask = self.codes[dim] == self.labels[dim].index(group)
+            risk = self.risk
+        if level is not None:
+            lo, hi = {RISK_LEVELS[0]: (0, 30), RISK_LEVELS[1]: (30, 60), RISK_LEVELS[2]: (60, np.inf)}[level]
+            mask &= (risk >= lo) & (risk < hi)
+        idx = np.flatnonzero(mask)
+        idx = idx[np.argsort(-risk[idx], kind="stable")][:limit]
+        return pd.DataFrame({ID_COL: self.ids[idx], "risk_probability": risk[idx]})
+
+
+def refresh_aggregates(current, df, risk, version):
+    """Reuse and incrementally update current when the students are the same,
+    otherwise build from scratch."""
+    if current is None or not current.same_students(df):
+        return CohortAggregates(df, risk, version)
+    if current.version != version:
+        current.sync(risk, version)
+    return current
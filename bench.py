@@ -0,0 +1,253 @@
+# ================================================
+# ⏱️ Benchmark Suite
+# ================================================
+# Times every stage the apps go through - load, model load/train,
+# encode, predict, persist, report - across dataset sizes synthesized
+# up from the 20k-row CSV, and compares against a stored baseline.
+#
+#   python bench.py --save-baseline              # record bench_baseline.json
+#   python bench.py                              # run and compare
+#   python bench.py --sizes 20000 100000 --train # include the cold training path
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from data_cache import compact_dtypes, load_dataset
+from feature_schema import ID_COL, TARGET_COL, FeatureSchema, training_columns
+from scoring import build_cohort_index
+
+
+RESULTS_PATH = os.path.join(".cache", "bench_results.json")
+BASELINE_PATH = "bench_baseline.json"
+
+
+def timeit(fn, repeats=5):
+    """Median wall time of fn() in seconds."""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def synthesize(df, n_rows, seed=0):
+    """Resample df up (or down) to n_rows with fresh student IDs."""
+    rng = np.random.default_rng(seed)
+    out = df.iloc[rng.integers(0, len(df), n_rows)].reset_index(drop=True)
+    out[ID_COL] = np.arange(n_rows) + 10_000_000
+    return out
+
+
+def bench_load(workdir, df, repeats):
+    csv_path = os.path.join(workdir, "students.csv")
+    df.to_csv(csv_path, index=False)
+    cache_dir = os.path.join(workdir, "cache")
+    results = {"load_csv": timeit(lambda: pd.read_csv(csv_path), repeats)}
+
+    def cold():
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        load_dataset(csv_path, cache_dir=cache_dir)
+
+    results["load_dataset_cold"] = timeit(cold, repeats)
+    results["load_dataset_warm"] = timeit(lambda: load_dataset(csv_path, cache_dir=cache_dir), repeats)
+    return results
+
+
+def bench_excel(workdir, df, repeats):
+    xlsx_path = os.path.join(workdir, "students.xlsx")
+    df.to_excel(xlsx_path, index=False)
+    return {"load_excel": timeit(lambda: pd.read_excel(xlsx_path), max(1, repeats // 2))}
+
+
+def bench_model_paths(workdir, df, model, le_dict, repeats, train):
+    """Warm (pickle + cached data + cohort index) and optionally cold (train) paths."""
+    model_path = os.path.join(workdir, "model.pkl")
+    joblib.dump((model, le_dict), model_path)
+    data_path = os.path.join(workdir, "students.csv")
+    cache_dir = os.path.join(workdir, "cache")
+    load_dataset(data_path, cache_dir=cache_dir)
+
+    def warm():
+        m, le = joblib.load(model_path)
+        build_cohort_index(load_dataset(data_path, cache_dir=cache_dir), m, le)
+
+    results = {"load_or_train_model_warm": timeit(warm, repeats)}
+    if train:
+        from train import train_model
+        ckpt = os.path.join(workdir, "ckpt.json")
+        results["load_or_train_model_cold"] = timeit(
+            lambda: train_model(load_dataset(data_path, cache_dir=cache_dir), checkpoint_path=ckpt,
+                                log=lambda msg: None), 1)
+    return results
+
+
+def bench_encode_predict(df, model, le_dict, repeats):
+    from forest_compiler import compile_forest
+
+    schema = FeatureSchema.from_model(model, le_dict, df)
+    row = df.iloc[[0]]
+    record = df.iloc[0].to_dict()
+    X = schema.frame(df)
+    X_row = X.iloc[[0]]
+    compiled = compile_forest(model)
+    # encode_input (streamlit.py) and transform_input_row (ff.py) were
+    # replaced by FeatureSchema; the stage names are kept for the baseline
+    return {
+        "encode_input_single_row": timeit(lambda: schema.frame(row), repeats * 4),
+        "encode_input_batch": timeit(lambda: schema.matrix(df), repeats),
+        "transform_input_row_single_row": timeit(lambda: schema.row(record), repeats * 4),
+        "predict_proba_single_row": timeit(lambda: model.predict_proba(X_row), repeats * 4),
+        "compiled_single_row": timeit(lambda: compiled.predict_proba(X_row.to_numpy()), repeats * 4),
+        "predict_proba_batch": timeit(lambda: model.predict_proba(X), repeats),
+    }
+
+
+def bench_persist(df, repeats, n_records=500):
+    try:
+        import mongomock
+    except ImportError:
+        return {}
+    from write_buffer import WriteBehindBuffer
+
+    records = [
+        {"student_id": int(r[ID_COL]), "risk_probability": float(i % 100), "cgpa": float(r["cgpa"]),
+         "timestamp": pd.Timestamp.now().isoformat()}
+        for i, (_, r) in enumerate(df.head(n_records).iterrows())
+    ]
+
+    def run():
+        collection = mongomock.MongoClient().db.risk_records
+        buffer = WriteBehindBuffer(collection, max_batch=100, background=False)
+        for rec in records:
+            buffer.submit(rec)
+            if buffer.pending() >= buffer.max_batch:
+                buffer.flush()
+        buffer.flush()
+
+    def sync_upserts():
+        collection = mongomock.MongoClient().db.risk_records
+        for rec in records:
+            collection.update_one({"student_id": rec["student_id"]}, {"$set": rec}, upsert=True)
+
+    return {
+        "save_student_record_buffered_per_record": timeit(run, repeats) / n_records,
+        "save_student_record_sync_per_record": timeit(sync_upserts, repeats) / n_records,
+    }
+
+
+def bench_report(df, repeats):
+    from reports import RISK_ADVICE, generate_pdf
+
+    student = df.iloc[0]
+    causes, recommendations = RISK_ADVICE["High Risk"]
+    return {"generate_pdf": timeit(lambda: generate_pdf(student, 72.5, "High Risk", causes, recommendations),
+                                   repeats)}
+
+
+def fit_bench_model(df):
+    """Small fixed forest used when no pickle is available."""
+    from sklearn.ensemble import RandomForestClassifier
+    from train import fit_label_encoders
+
+    encoded, le_dict = fit_label_encoders(df)
+    model = RandomForestClassifier(n_estimators=150, max_depth=10, random_state=42, n_jobs=-1)
+    model.fit(encoded[training_columns(encoded)], encoded[TARGET_COL])
+    return model, le_dict
+
+
+def run_suite(source, sizes, model_path, repeats=5, train=False, excel=True):
+    base = pd.read_csv(source) if source.lower().endswith(".csv") else load_dataset(source)
+    if os.path.exists(model_path):
+        model, le_dict = joblib.load(model_path)
+    else:
+        model, le_dict = fit_bench_model(compact_dtypes(base))
+
+    results = {}
+    for n in sizes:
+        df = synthesize(base, n)
+        stages = {}
+        with tempfile.TemporaryDirectory() as workdir:
+            stages.update(bench_load(workdir, df, repeats))
+            if excel and n <= 50_000:
+                stages.update(bench_excel(workdir, df, repeats))
+            stages.update(bench_model_paths(workdir, df, model, le_dict, repeats, train and n == sizes[0]))
+        df = compact_dtypes(df)
+        stages.update(bench_encode_predict(df, model, le_dict, repeats))
+        stages.update(bench_persist(df, repeats))
+        stages.update(bench_report(df, repeats))
+        results[str(n)] = stages
+        print(f"size {n:,}: " + ", ".join(f"{k}={v * 1e3:.2f}ms" for k, v in stages.items()))
+
+    return {
+        "meta": {
+            "timestamp": pd.Timestamp.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "source": source,
+            "n_trees": len(model.estimators_),
+            "repeats": repeats,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, tolerance=0.10):
+    """Print per-stage ratios; returns the number of regressions."""
+    regressions = 0
+    for size, stages in current["results"].items():
+        base_stages = baseline.get("results", {}).get(size, {})
+        for stage, seconds in stages.items():
+            if stage not in base_stages:
+                continue
+            ratio = seconds / base_stages[stage] if base_stages[stage] else float("inf")
+            flag = "▲ slower" if ratio > 1 + tolerance else "▼ faster" if ratio < 1 - tolerance else ""
+            regressions += ratio > 1 + tolerance
+            print(f"{size:>8} {stage:<42} {base_stages[stage] * 1e3:10.3f} -> {seconds * 1e3:10.3f} ms "
+                  f"x{ratio:5.2f} {flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark load/encode/predict/persist/report stages.")
+    parser.add_argument("--source", default="cleaned_dataset (1).csv")
+    parser.add_argument("--model", default="rf_student_engagement_model.pkl")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20_000, 100_000])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--train", action="store_true", help="also time the cold training path")
+    parser.add_argument("--no-excel", action="store_true")
+    parser.add_argument("--out", default=RESULTS_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    current = run_suite(args.source, args.sizes, args.model, args.repeats, args.train, not args.no_excel)
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w") as fh:
+        json.dump(current, fh, indent=2)
+    print(f"Saved results to {args.out}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as fh:
+            json.dump(current, fh, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as fh:
+            regressions = compare(current, json.load(fh), args.tolerance)
+        print(f"{regressions} stage(s) slower than baseline by more than {args.tolerance:.0%}")
+        raise SystemExit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
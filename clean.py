@@ -0,0 +1,225 @@
+# ================================================
+# 🧹 Streaming Dataset Cleaner
+# ================================================
+# Builds the training table from the raw SIS export
+# (e.g. "cleaned_dataset (1).csv") in fixed-size chunks, so memory stays
+# bounded for multi-million-row extracts:
+#
+#   pass 1: normalise codes, collect per-column statistics for imputation
+#   pass 2: normalise, impute, enforce dtypes, append to the Parquet file
+#
+# Only NA_VALUES mean "missing": pandas' default list would also swallow
+# the real parental_education category "None". Raw codes missing from
+# CATEGORY_LOOKUP are counted and logged per column before being imputed.
+#
+#   python clean.py "cleaned_dataset (1).csv" --out .cache/training_table.parquet
+
+import argparse
+import os
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from scoring import ID_COL, TARGET_COL
+
+
+# Placeholders that mean "no value"
+NA_VALUES = ["", "-", "--", "NA", "N/A", "n/a", "null", "NULL", "?"]
+
+YES_NO = {"y": "Yes", "yes": "Yes", "true": "Yes", "1": "Yes",
+          "n": "No", "no": "No", "nope": "No", "false": "No", "0": "No"}
+
+# Raw code (lower-cased) -> canonical category
+CATEGORY_LOOKUP = {
+    "gender": {"m": "Male", "male": "Male", "f": "Female", "female": "Female",
+               "other": "Other", "o": "Other"},
+    "department": {"cs": "CS", "cse": "CS", "it": "IT", "ece": "ECE", "eee": "EEE",
+                   "me": "ME", "mech": "ME", "mechanical": "ME", "civil": "CIVIL",
+                   "commerce": "COMMERCE", "bio": "BIO", "arts": "ARTS"},
+    "scholarship": YES_NO,
+    "extra_curricular": YES_NO,
+    "sports_participation": YES_NO,
+    "parental_education": {"none": "None", "primary": "Primary", "secondary": "Secondary",
+                           "graduate": "Graduate", "postgraduate": "Postgraduate",
+                           "post graduate": "Postgraduate", "phd": "PhD"},
+}
+
+# Valid ranges; anything outside is treated as missing and imputed
+NUMERIC_RANGES = {
+    "age": (14, 60),
+    "cgpa": (0, 10),
+    "attendance_rate": (0, 100),
+    "family_income": (0, None),
+    "past_failures": (0, None),
+    "study_hours_per_week": (0, 168),
+    "assignments_submitted": (0, None),
+    "projects_completed": (0, None),
+    "total_activities": (0, None),
+}
+INT_COLUMNS = ["age", "family_income", "past_failures", "assignments_submitted",
+               "projects_completed", "total_activities"]
+FLOAT_COLUMNS = ["cgpa", "attendance_rate", "study_hours_per_week"]
+COLUMN_ORDER = [ID_COL, "gender", "department", "scholarship", "parental_education",
+                "extra_curricular", "age", "cgpa", "attendance_rate", "family_income",
+                "past_failures", "study_hours_per_week", "assignments_submitted",
+                "projects_completed", "total_activities", "sports_participation", TARGET_COL]
+
+
+def read_chunks(path, chunk_size):
+    return pd.read_csv(path, chunksize=chunk_size, na_values=NA_VALUES,
+                       keep_default_na=False, dtype=str, skipinitialspace=True)
+
+
+class SeenIds:
+    """Bitmap over the student_id range: one bit per possible ID instead of
+    a Python set holding every ID, so repeat detection stays small."""
+
+    def __init__(self):
+        self.base = None
+        self.bits = np.zeros(0, dtype=np.uint8)
+
+    def _cover(self, low, high):
+        if self.base is None:
+            self.base = low - low % 8
+        if low < self.base:
+            pad = (self.base - low + 7) // 8
+            self.bits = np.concatenate([np.zeros(pad, dtype=np.uint8), self.bits])
+            self.base -= pad * 8
+        need = (high - self.base) // 8 + 1
+        if need > len(self.bits):
+            # Grow geometrically so a rising ID range is not copied per chunk
+            grow = max(need - len(self.bits), len(self.bits))
+            self.bits = np.concatenate([self.bits, np.zeros(grow, dtype=np.uint8)])
+
+    def contains(self, ids):
+        found = np.zeros(len(ids), dtype=bool)
+        if self.base is None:
+            return found
+        offset = ids - self.base
+        inside = (offset >= 0) & (offset < len(self.bits) * 8)
+        offset = offset[inside]
+        found[inside] = (self.bits[offset >> 3] >> (offset & 7)) & 1
+        return found
+
+    def add(self, ids):
+        if not len(ids):
+            return
+        self._cover(int(ids.min()), int(ids.max()))
+        offset = ids - self.base
+        np.bitwise_or.at(self.bits, offset >> 3, (1 << (offset & 7)).astype(np.uint8))
+
+
+def normalise_chunk(chunk, seen_ids, unknown=None):
+    """Canonical codes, numeric parsing and range checks; drops repeat IDs.
+
+    seen_ids (a SeenIds) carries the IDs of earlier chunks. If given,
+    unknown[col] counts raw codes that CATEGORY_LOOKUP does not know.
+    """
+    chunk = chunk.copy()
+    chunk[ID_COL] = pd.to_numeric(chunk[ID_COL], errors="coerce")
+    chunk = chunk[chunk[ID_COL].notna()]
+    ids = chunk[ID_COL].to_numpy(dtype=np.int64)
+    fresh = ~pd.Series(ids).duplicated().to_numpy() & ~seen_ids.contains(ids)
+    chunk = chunk[fresh]
+    seen_ids.add(ids[fresh])
+
+    for col, lookup in CATEGORY_LOOKUP.items():
+        raw = chunk[col].str.strip()
+        chunk[col] = raw.str.lower().map(lookup)
+        if unknown is not None:
+            unknown[col].update(raw[raw.notna() & chunk[col].isna()].tolist())
+    for col, (low, high) in NUMERIC_RANGES.items():
+        values = pd.to_numeric(chunk[col], errors="coerce")
+        bad = (values < low) if low is not None else False
+        if high is not None:
+            bad = bad | (values > high)
+        chunk[col] = values.mask(bad)
+    chunk[TARGET_COL] = pd.to_numeric(chunk[TARGET_COL], errors="coerce")
+    return chunk[chunk[TARGET_COL].isin([0, 1])]
+
+
+def collect_statistics(path, chunk_size, log=print):
+    """Pass 1: mode per categorical column, mean per numeric column."""
+    counts = {col: Counter() for col in CATEGORY_LOOKUP}
+    unknown = {col: Counter() for col in CATEGORY_LOOKUP}
+    sums = dict.fromkeys(NUMERIC_RANGES, 0.0)
+    n = dict.fromkeys(NUMERIC_RANGES, 0)
+    seen = SeenIds()
+    for chunk in read_chunks(path, chunk_size):
+        chunk = normalise_chunk(chunk, seen, unknown)
+        for col in counts:
+            counts[col].update(chunk[col].dropna().tolist())
+        for col in sums:
+            sums[col] += float(chunk[col].sum())
+            n[col] += int(chunk[col].count())
+
+    fill = {}
+    for col, counter in counts.items():
+        fill[col] = counter.most_common(1)[0][0] if counter else "Unknown"
+    for col in sums:
+        mean = sums[col] / n[col] if n[col] else 0.0
+        fill[col] = round(mean) if col in INT_COLUMNS else mean
+
+    for col, counter in unknown.items():
+        if counter:
+            examples = ", ".join(f"{code!r} x{count:,}" for code, count in counter.most_common(5))
+            log(f"{col}: {sum(counter.values()):,} unknown codes imputed as {fill[col]!r} ({examples})")
+    return fill
+
+
+def enforce_dtypes(chunk, fill):
+    out = {ID_COL: chunk[ID_COL].astype(np.int32)}
+    for col in CATEGORY_LOOKUP:
+        categories = sorted(set(CATEGORY_LOOKUP[col].values()) | {fill[col]})
+        out[col] = pd.Categorical(chunk[col].fillna(fill[col]), categories=categories)
+    for col in INT_COLUMNS:
+        out[col] = chunk[col].fillna(fill[col]).round().astype(np.int32)
+    for col in FLOAT_COLUMNS:
+        out[col] = chunk[col].fillna(fill[col]).astype(np.float32)
+    out[TARGET_COL] = chunk[TARGET_COL].astype(np.int8)
+    return pd.DataFrame(out, index=chunk.index)[COLUMN_ORDER]
+
+
+def clean_csv(path, out_path, chunk_size=50_000, log=print):
+    """Stream path through the cleaner into a Parquet file. Returns the row count."""
+    start = time.perf_counter()
+    fill = collect_statistics(path, chunk_size, log)
+
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    tmp_path = out_path + ".tmp"
+    writer = None
+    rows = 0
+    seen = SeenIds()
+    try:
+        for chunk in read_chunks(path, chunk_size):
+            chunk = enforce_dtypes(normalise_chunk(chunk, seen), fill)
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp_path, table.schema)
+            writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        raise ValueError(f"No rows found in {path}")
+    os.replace(tmp_path, out_path)
+    log(f"Cleaned {rows:,} rows into {out_path} in {time.perf_counter() - start:.2f}s")
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream-clean a raw student CSV into Parquet.")
+    parser.add_argument("source", nargs="?", default="cleaned_dataset (1).csv")
+    parser.add_argument("--out", default=os.path.join(".cache", "training_table.parquet"))
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    args = parser.parse_args(argv)
+    clean_csv(args.source, args.out, chunk_size=args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# ================================================
+# 📦 Columnar Dataset Cache
+# ================================================
+# Parsing Hackathon_Cleaned.xlsx with openpyxl is the slowest part of a
+# cold start. The workbook is converted once to Parquet (compact dtypes)
+# and re-read from there until the source file changes.
+
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+
+CACHE_DIR = ".cache"
+
+
+def file_sha1(path, block_size=1 << 20):
+    digest = hashlib.sha1()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def compact_dtypes(df):
+    """Categoricals for text columns, int32/float32 for numeric ones."""
+    out = {}
+    for col in df.columns:
+        values = df[col]
+        if pd.api.types.is_bool_dtype(values):
+            out[col] = values
+        elif pd.api.types.is_integer_dtype(values):
+            if values.min() >= np.iinfo(np.int32).min and values.max() <= np.iinfo(np.int32).max:
+                values = values.astype(np.int32)
+            out[col] = values
+        elif pd.api.types.is_float_dtype(values):
+            out[col] = values.astype(np.float32)
+        elif isinstance(values.dtype, pd.CategoricalDtype):
+            out[col] = values
+        else:
+            out[col] = values.astype("category")
+    return pd.DataFrame(out, index=df.index)
+
+
+def as_float(value):
+    """Python float of a cell for display or storage. float32 cells go
+    through their shortest repr, so 4.0817914 stays 4.0817914 instead of
+    widening to 4.081791400909424."""
+    if isinstance(value, np.float32):
+        return float(str(value))
+    return float(value)
+
+
+def read_source(path):
+    if path.lower().endswith((".xlsx", ".xls")):
+        return pd.read_excel(path)
+    if path.lower().endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def _cache_paths(path, cache_dir):
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir, name + ".parquet"), os.path.join(cache_dir, name + ".meta.json")
+
+
+def _source_meta(path):
+    st = os.stat(path)
+    return {"source": os.path.abspath(path), "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+def replace_atomically(final_path, write):
+    """write(tmp_path) into a unique temp file, then move it into place, so
+    concurrent writers (app, refresh watcher, replicas) never share a .tmp."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(final_path) or ".",
+                                    prefix=os.path.basename(final_path) + ".", suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        # mkstemp files are owner-only; keep the usual permissions
+        mode = os.stat(final_path).st_mode & 0o777 if os.path.exists(final_path) else 0o644
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, final_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _write_meta(meta_path, meta):
+    def write(tmp_path):
+        with open(tmp_path, "w") as fh:
+            json.dump(meta, fh)
+    replace_atomically(meta_path, write)
+
+
+def _cache_is_fresh(path, meta_path):
+    if not os.path.exists(meta_path):
+        return False
+    with open(meta_path) as fh:
+        cached = json.load(fh)
+    current = _source_meta(path)
+    if cached.get("mtime_ns") == current["mtime_ns"] and cached.get("size") == current["size"]:
+        return True
+    # mtime changed (copy, checkout) - fall back to the content hash
+    if cached.get("size") == current["size"] and cached.get("sha1") == file_sha1(path):
+        cached.update(current)
+        _write_meta(meta_path, cached)
+        return True
+    return False
+
+
+def load_dataset(path, cache_dir=CACHE_DIR):
+    """Load a dataset through the Parquet cache, rebuilding it if stale."""
+    cache_path, meta_path = _cache_paths(path, cache_dir)
+    if os.path.exists(cache_path) and _cache_is_fresh(path, meta_path):
+        return pd.read_parquet(cache_path)
+
+    df = compact_dtypes(read_source(path))
+    os.makedirs(cache_dir, exist_ok=True)
+    replace_atomically(cache_path, lambda tmp_path: df.to_parquet(tmp_path, index=False))
+
+    meta = _source_meta(path)
+    meta["sha1"] = file_sha1(path)
+    _write_meta(meta_path, meta)
+    return df
@@ -0,0 +1,91 @@
+# ================================================
+# 🔍 Per-Student Risk Drivers
+# ================================================
+# Tree-path decomposition: along each root-to-leaf path, the change in
+# the node's dropout probability at a split is credited to the split
+# feature. Every tree is reduced once to a leaf -> contribution table,
+# after which the whole cohort is explained with model.apply and a
+# gather per tree (no per-request traversal):
+#
+#   risk = bias + sum(contributions)          (both in %)
+#
+# Older models were fitted with student_id as a feature. Its contribution
+# stays in the table (so the sum still holds) but it is never reported as
+# a driver: an identifier is not a cause of risk.
+
+import numpy as np
+
+from scoring import ID_COL, encode_frame, feature_columns
+
+
+FEATURE_LABELS = {"cgpa": "CGPA"}
+
+
+def feature_label(col):
+    return FEATURE_LABELS.get(col, col.replace('_', ' ').title())
+
+def _tree_leaf_contributions(tree, n_features, positive=1):
+    """(node_count, n_features) path contributions for one fitted tree_."""
+    value = tree.value[:, 0, :]
+    total = value.sum(axis=1)
+    total[total == 0.0] = 1.0
+    p = value[:, positive] / total
+
+    contrib = np.zeros((tree.node_count, n_features))
+    frontier = np.array([0])
+    while frontier.size:
+        internal = frontier[tree.children_left[frontier] != -1]
+        if not internal.size:
+            break
+        feat = tree.feature[internal]
+        children = []
+        for side in (tree.children_left, tree.children_right):
+            child = side[internal]
+            contrib[child] = contrib[internal]
+            contrib[child, feat] += p[child] - p[internal]
+            children.append(child)
+        frontier = np.concatenate(children)
+    return contrib, p[0]
+
+
+class CohortExplanation:
+    """Contributions (in risk %) per student and feature, aligned with df rows."""
+
+    def __init__(self, columns, contributions, bias):
+        self.columns = list(columns)
+        self.contributions = contributions
+        self.bias = bias
+
+    def top_drivers(self, position, k=3, positive_only=True):
+        """[(feature, contribution)] sorted by how much they raise the risk."""
+        row = self.contributions[position]
+        order = [i for i in np.argsort(-row) if self.columns[i] != ID_COL]
+        drivers = [(self.columns[i], float(row[i])) for i in order[:k] if row[i] > 0 or not positive_only]
+        return drivers
+
+    def describe(self, position, student, k=3):
+        """Human-readable driver lines for the Dashboard and reports."""
+        lines = []
+        for col, contrib in self.top_drivers(position, k):
+            value = student[col]
+            if isinstance(value, (float, np.floating)):
+                value = round(float(value), 2)
+            lines.append(f"{feature_label(col)} = {value} (+{contrib:.1f}% risk)")
+        return lines
+
+
+def explain_cohort(df, model, le_dict, positive=1):
+    """Explain every row of df in one vectorized pass over the forest."""
+    columns = feature_columns(model, df)
+    X = encode_frame(df, le_dict, columns)
+    leaves = model.apply(X)
+    n_features = len(columns)
+
+    contributions = np.zeros((len(df), n_features))
+    bias = 0.0
+    for t, est in enumerate(model.estimators_):
+        table, root = _tree_leaf_contributions(est.tree_, n_features, positive)
+        contributions += table[leaves[:, t]]
+        bias += root
+    n_trees = len(model.estimators_)
+    return CohortExplanation(columns, contributions * 100 / n_trees, bias * 100 / n_trees)
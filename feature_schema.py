@@ -0,0 +1,105 @@
+# ================================================
+# 🧬 Feature Schema (compiled categorical encoders)
+# ================================================
+# One encoder for every app and tool. The saved LabelEncoders are compiled
+# into plain dict lookups once, the column order is fixed to the model's,
+# and categories the encoders never saw map to UNSEEN (-1, below every
+# fitted code). Whole DataFrames are encoded column by column into one
+# NumPy matrix; single requests go straight from a dict to a 1-row matrix.
+#
+# student_id is an identifier, not a feature: models trained from now on
+# leave it out, while older pickles keep the columns in feature_names_in_.
+
+import numpy as np
+import pandas as pd
+
+
+TARGET_COL = "dropout"
+ID_COL = "student_id"
+UNSEEN = -1
+NON_FEATURES = (TARGET_COL, ID_COL)
+
+
+def training_columns(df):
+    """Feature columns for a new model: everything but the target and ID."""
+    return [c for c in df.columns if c not in NON_FEATURES]
+
+
+def feature_columns(model, df=None):
+    """Column order the model was fitted with."""
+    if hasattr(model, "feature_names_in_"):
+        return list(model.feature_names_in_)
+    return [c for c in df.columns if c != TARGET_COL]
+
+
+def _missing_code(lookup, unseen):
+    """Code of the class a blank cell was fitted as ("nan" or NaN)."""
+    for cls, code in lookup.items():
+        if cls == "nan" or (isinstance(cls, float) and np.isnan(cls)):
+            return code
+    return unseen
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and np.isnan(value))
+
+
+class FeatureSchema:
+    """Saved LabelEncoders compiled to lookup tables, in a fixed column order."""
+
+    def __init__(self, columns, le_dict, unseen=UNSEEN):
+        self.columns = list(columns)
+        self.unseen = unseen
+        self.lookups = {}
+        self.missing = {}
+        for col in self.columns:
+            if col in le_dict:
+                lookup = {str(c): i for i, c in enumerate(le_dict[col].classes_)}
+                self.lookups[col] = lookup
+                self.missing[col] = _missing_code(lookup, unseen)
+
+    @classmethod
+    def from_model(cls, model, le_dict, df=None, unseen=UNSEEN):
+        return cls(feature_columns(model, df), le_dict, unseen)
+
+    def _codes(self, col, values):
+        # Map the few distinct categories, then gather by code
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype("category")
+        lookup = self.lookups[col]
+        cats = np.fromiter((lookup.get(str(c), self.unseen) for c in values.cat.categories),
+                           dtype=np.int64, count=len(values.cat.categories))
+        table = np.append(cats, self.missing[col])
+        return table[values.cat.codes.to_numpy()]
+
+    def matrix(self, df, dtype=np.float64):
+        """(len(df), n_features) matrix in model column order."""
+        X = np.empty((len(df), len(self.columns)), dtype=dtype)
+        for j, col in enumerate(self.columns):
+            values = df[col] if col in df else pd.Series(np.nan, index=df.index)
+            X[:, j] = self._codes(col, values) if col in self.lookups else values.to_numpy(dtype=dtype)
+        return X
+
+    def frame(self, df):
+        """matrix() with column names, for estimators fitted on DataFrames."""
+        return pd.DataFrame(self.matrix(df), columns=self.columns, index=df.index)
+
+    def row(self, record, dtype=np.float64):
+        """1-row matrix from a dict-like record (absent fields become NaN)."""
+        X = np.empty((1, len(self.columns)), dtype=dtype)
+        for j, col in enumerate(self.columns):
+            value = record.get(col)
+            lookup = self.lookups.get(col)
+            if lookup is None:
+                X[0, j] = np.nan if value is None else value
+            elif _is_missing(value):
+                X[0, j] = self.missing[col]
+            else:
+                X[0, j] = lookup.get(str(value), self.unseen)
+        return X
+
+    def rows(self, records, dtype=np.float64):
+        """Matrix from a list of dict-like records."""
+        if not records:
+            return np.empty((0, len(self.columns)), dtype=dtype)
+        return np.vstack([self.row(r, dtype) for r in records])
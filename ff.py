@@ -6,11 +6,15 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import joblib
-import matplotlib.pyplot as plt
-import random
 from sklearn.preprocessing import LabelEncoder
 from sklearn.ensemble import RandomForestClassifier
 
+from feature_schema import ID_COL, FeatureSchema
+from figure_cache import risk_bar_png
+from forest_compiler import compile_forest
+from intents import reply_for
+from what_if import RiskSurfaceEngine
+
 st.set_page_config(page_title="Student Risk Predictor", layout="wide")
 
 # =======================================
@@ -36,7 +40,8 @@ def load_or_train_model():
             df[col] = le.fit_transform(df[col])
             le_dict[col] = le
 
-        X = df.drop("dropout", axis=1)
+        # student_id identifies a row; it is not a feature
+        X = df.drop(columns=["dropout", ID_COL], errors="ignore")
         y = df["dropout"]
 
         model = RandomForestClassifier(n_estimators=200, random_state=42)
@@ -52,24 +57,32 @@ def load_or_train_model():
 
 model, le_dict = load_or_train_model()
 
+
+@st.cache_resource
+def get_compiled_forest():
+    """Flat-array copy of the forest for fast single-row predictions."""
+    return compile_forest(model)
+
 # =======================================
 # 2️⃣ Helper Functions
 # =======================================
-def transform_input_row(X, le_dict):
-    """Encode categorical inputs dynamically."""
-    X_encoded = X.copy().reset_index(drop=True)
-    for col in X.columns:
-        if col in le_dict:
-            val = X.iloc[0][col]  # ✅ positional access avoids KeyError
-            if val in le_dict[col].classes_:
-                X_encoded[col] = le_dict[col].transform([val])
-            else:
-                X_encoded[col] = -1
-    return X_encoded
-
-
-def simulate_risk(attendance, marks):
-    """Simple simulation function."""
+@st.cache_resource
+def get_feature_schema():
+    """Compiled encoders in model column order (unseen values -> -1)."""
+    return FeatureSchema.from_model(model, le_dict)
+
+
+@st.cache_resource
+def get_surface_engine():
+    return RiskSurfaceEngine(model, le_dict, maxsize=16)
+
+
+def simulate_risk(attendance, marks, profile=None):
+    """Model-based risk from the what-if surface when a profile is known,
+    otherwise the simple heuristic. Marks (%) map onto CGPA as marks / 10."""
+    if profile is not None:
+        key = tuple(sorted(profile.items()))
+        return get_surface_engine().risk(key, pd.Series(profile), attendance, marks / 10)
     risk = max(0, 100 - (0.6 * attendance + 0.4 * marks))
     return risk
 
@@ -143,18 +156,14 @@ elif menu == "📊 Risk Prediction":
             "sports_participation": sports_participation
         }
 
-        X_input = pd.DataFrame([input_data]).reset_index(drop=True)
-        X_enc = transform_input_row(X_input, le_dict)
-        pred_prob = model.predict_proba(X_enc)[0][1] * 100
+        st.session_state.last_profile = input_data
+
+        X_enc = get_feature_schema().row(input_data)
+        pred_prob = get_compiled_forest().predict_proba(X_enc)[0][1] * 100
 
         st.subheader(f"🎯 Predicted Dropout Risk: {pred_prob:.2f}%")
 
-        fig, ax = plt.subplots(figsize=(6, 0.4))
-        color = plt.cm.RdYlGn_r(pred_prob / 100)
-        ax.barh(0, pred_prob, color=color)
-        ax.set_xlim(0, 100)
-        ax.set_yticks([])
-        st.pyplot(fig)
+        st.image(risk_bar_png(pred_prob), use_container_width=True)
 
 # =======================================
 # 6️⃣ Chatbot Assistant
@@ -167,34 +176,9 @@ elif menu == "💬 Chatbot Assistant":
 
     user_input = st.text_input("💭 Ask me anything about academics or performance:")
 
-    motivational_quotes = [
-        "Every expert was once a beginner. Keep going!",
-        "Consistency beats intensity — study a little every day.",
-        "Your effort today is your success tomorrow.",
-        "Believe you can, and you're halfway there."
-    ]
-
-    academic_tips = [
-        "Try scheduling short, focused study sessions (Pomodoro method).",
-        "Join a peer study group or discussion circle.",
-        "Focus on weak areas first — use your risk report to guide priorities.",
-        "Ask your mentor for weekly progress feedback."
-    ]
-
     if st.button("💬 Chat"):
         if user_input:
-            if "attendance" in user_input.lower():
-                bot_reply = "Maintaining attendance above 75% can significantly reduce dropout risk."
-            elif "cgpa" in user_input.lower() or "grade" in user_input.lower():
-                bot_reply = "Improving CGPA often requires consistent review and practice."
-            elif "motivate" in user_input.lower() or "motivation" in user_input.lower():
-                bot_reply = random.choice(motivational_quotes)
-            elif "study" in user_input.lower():
-                bot_reply = random.choice(academic_tips)
-            elif "help" in user_input.lower() or "how" in user_input.lower():
-                bot_reply = "I can help you interpret your results or suggest improvement strategies."
-            else:
-                bot_reply = "That's a great question! Try asking about study habits or CGPA improvement."
+            bot_reply = reply_for(user_input)
 
             st.session_state.chat_history.append(("You", user_input))
             st.session_state.chat_history.append(("Bot", bot_reply))
@@ -215,14 +199,12 @@ elif menu == "🧮 Simulation Panel":
     attendance = st.slider("📆 Attendance (%)", 0, 100, 75)
     marks = st.slider("🧾 Average Marks (%)", 0, 100, 80)
 
-    risk_sim = simulate_risk(attendance, marks)
+    profile = st.session_state.get("last_profile")
+    if profile is None:
+        st.info("Run a prediction in 📊 Risk Prediction to simulate with the trained model.")
+    risk_sim = simulate_risk(attendance, marks, profile)
     st.markdown(f"### 🔮 Predicted Risk after Simulation: *{risk_sim:.2f}%*")
 
-    fig, ax = plt.subplots(figsize=(6, 0.4))
-    color = plt.cm.RdYlGn_r(risk_sim / 100)
-    ax.barh(0, risk_sim, color=color)
-    ax.set_xlim(0, 100)
-    ax.set_yticks([])
-    st.pyplot(fig)
+    st.image(risk_bar_png(risk_sim), use_container_width=True)
 
     st.success("✅ Adjust sliders to simulate different academic outcomes.")
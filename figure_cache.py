@@ -0,0 +1,86 @@
+# ================================================
+# 🖼️ Bounded Figure Cache
+# ================================================
+# The risk bars used to be drawn with plt.subplots on every rerun and
+# never closed, so pyplot's global figure registry grew for the lifetime
+# of the server. Bars are now drawn on standalone matplotlib Figures (not
+# registered with pyplot), rendered to PNG once per rounded risk value and
+# kept in an LRU. Plotly gauges and pies are cached the same way; callers
+# must treat returned figures as read-only.
+
+import io
+from functools import lru_cache
+
+
+BAR_RESOLUTION = 0.5   # risk % step of cached bar images
+
+
+@lru_cache(maxsize=512)
+def _risk_bar_png(bucket, resolution, xlabel, dpi):
+    from matplotlib import colormaps
+    from matplotlib.figure import Figure
+
+    risk = bucket * resolution
+    fig = Figure(figsize=(6, 0.4))
+    ax = fig.subplots()
+    ax.barh(0, risk, color=colormaps["RdYlGn_r"](risk / 100))
+    ax.set_xlim(0, 100)
+    ax.set_yticks([])
+    if xlabel:
+        ax.set_xlabel(xlabel)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+    return buffer.getvalue()
+
+
+def risk_bar_png(risk, xlabel=None, resolution=BAR_RESOLUTION, dpi=150):
+    """PNG bytes of the horizontal risk bar, shared across reruns."""
+    bucket = int(round(min(max(float(risk), 0.0), 100.0) / resolution))
+    return _risk_bar_png(bucket, resolution, xlabel, dpi)
+
+
+@lru_cache(maxsize=256)
+def _gauge(value):
+    import plotly.graph_objects as go
+
+    return go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=value,
+        title={'text': "Dropout Risk (%)"},
+        gauge={
+            'axis': {'range': [0, 100]},
+            'bar': {'color': "red" if value > 60 else "orange" if value > 30 else "green"},
+            'steps': [
+                {'range': [0, 30], 'color': "lightgreen"},
+                {'range': [30, 60], 'color': "yellow"},
+                {'range': [60, 100], 'color': "salmon"}
+            ],
+        }
+    ))
+
+
+def gauge_figure(risk):
+    """Dashboard risk gauge for a risk %, cached by its 2-decimal value."""
+    return _gauge(round(float(risk), 2))
+
+
+@lru_cache(maxsize=256)
+def _pie(labels, values):
+    import plotly.graph_objects as go
+
+    return go.Figure(data=[go.Pie(labels=list(labels), values=list(values), hole=.4)])
+
+
+def pie_figure(labels, values):
+    """Donut chart, cached by its labels and values."""
+    return _pie(tuple(labels), tuple(float(v) for v in values))
+
+
+def cache_info():
+    """{name: (hits, misses, size)} for the debug panel."""
+    return {
+        name: (info.hits, info.misses, info.currsize)
+        for name, info in (("risk_bar", _risk_bar_png.cache_info()),
+                           ("gauge", _gauge.cache_info()),
+                           ("pie", _pie.cache_info()))
+    }
@@ -0,0 +1,203 @@
+# ================================================
+# 🌲 Compiled Flat-Array Forest Predictor
+# ================================================
+# Exports a fitted RandomForestClassifier into contiguous NumPy node
+# arrays and walks all trees at once for a row or a small batch. This
+# skips joblib thread dispatch and the per-tree Python loop that
+# sklearn's predict_proba pays on every interactive request.
+#
+#   python forest_compiler.py [model.pkl] [data.xlsx]   -> benchmark
+
+import sys
+import time
+
+import numpy as np
+
+
+class CompiledForest:
+    """All trees of a forest packed into shared node arrays.
+
+    Child indices are absolute; leaves point to themselves, so every
+    row can take exactly `max_depth` steps.
+    """
+
+    def __init__(self, feature, threshold, left, right, missing_left, value, roots, max_depth,
+                 feature_names=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.feature_names = feature_names
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def feature_names_in_(self):
+        # Lets feature_columns()/FeatureSchema treat it like the sklearn model
+        if self.feature_names is None:
+            raise AttributeError("feature_names_in_")
+        return np.asarray(self.feature_names, dtype=object)
+
+    def apply(self, X):
+        """Leaf node index per (tree, row), shape (n_trees, n_rows)."""
+        # sklearn compares float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(X.shape[0])[None, :]
+        node = np.repeat(self.roots[:, None], X.shape[0], axis=1)
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[node]]
+            go_left = x <= self.threshold[node]
+            nan = np.isnan(x)
+            if nan.any():
+                go_left = np.where(nan, self.missing_left[node], go_left)
+            node = np.where(go_left, self.left[node], self.right[node])
+        return node
+
+    def predict_proba(self, X, chunk_size=4096):
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        out = np.zeros((X.shape[0], self.value.shape[1]))
+        for start in range(0, X.shape[0], chunk_size):
+            leaves = self.apply(X[start:start + chunk_size])
+            acc = out[start:start + chunk_size]
+            # Accumulate tree by tree in estimator order, like sklearn
+            for t in range(self.n_trees):
+                acc += self.value[leaves[t]]
+        out /= self.n_trees
+        return out
+
+    def save(self, path):
+        np.savez(
+            path, feature=self.feature, threshold=self.threshold, left=self.left,
+            right=self.right, missing_left=self.missing_left, value=self.value,
+            roots=self.roots, max_depth=self.max_depth,
+            feature_names=np.asarray(self.feature_names if self.feature_names is not None else [], dtype=str),
+        )
+
+
+def compile_forest(model):
+    """Pack the trees of a fitted RandomForestClassifier into a CompiledForest."""
+    features, thresholds, lefts, rights, missing, values, roots = [], [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for est in model.estimators_:
+        tree = est.tree_
+        n = tree.node_count
+        is_leaf = tree.children_left == -1
+        own = np.arange(n) + offset
+
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(tree.threshold)
+        lefts.append(np.where(is_leaf, own, tree.children_left + offset))
+        rights.append(np.where(is_leaf, own, tree.children_right + offset))
+        if hasattr(tree, "missing_go_to_left"):
+            missing.append(tree.missing_go_to_left.astype(bool))
+        else:
+            missing.append(np.zeros(n, dtype=bool))
+
+        # Same normalisation as DecisionTreeClassifier.predict_proba
+        proba = tree.value[:, 0, :model.n_classes_].astype(np.float64)
+        normalizer = proba.sum(axis=1)[:, np.newaxis]
+        normalizer[normalizer == 0.0] = 1.0
+        values.append(proba / normalizer)
+
+        roots.append(offset)
+        offset += n
+        max_depth = max(max_depth, tree.max_depth)
+
+    return CompiledForest(
+        feature=np.concatenate(features).astype(np.intp),
+        threshold=np.concatenate(thresholds),
+        left=np.concatenate(lefts).astype(np.intp),
+        right=np.concatenate(rights).astype(np.intp),
+        missing_left=np.concatenate(missing),
+        value=np.ascontiguousarray(np.concatenate(values)),
+        roots=np.asarray(roots, dtype=np.intp),
+        max_depth=max_depth,
+        feature_names=list(getattr(model, "feature_names_in_", [])) or None,
+    )
+
+
+def load_compiled(path, mmap_mode=None):
+    data = np.load(path, mmap_mode=mmap_mode)
+    names = [str(n) for n in data["feature_names"]] or None
+    return CompiledForest(
+        feature=data["feature"], threshold=data["threshold"], left=data["left"],
+        right=data["right"], missing_left=data["missing_left"], value=data["value"],
+        roots=data["roots"], max_depth=int(data["max_depth"]), feature_names=names,
+    )
+
+
+# === Benchmark ===
+def _best_of(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark(model, X, compiled=None, batch_size=32, repeats=20):
+    """Time single-row and small-batch inference against model.predict_proba."""
+    compiled = compiled or compile_forest(model)
+    X = np.asarray(X, dtype=np.float32)
+    # Plain arrays for both paths, so neither pays for DataFrame checks
+    names = getattr(model, "feature_names_in_", None)
+    if names is not None:
+        model = _without_feature_names(model)
+
+    single, batch = X[:1], X[:batch_size]
+    report = {}
+    for label, rows in (("single_row", single), ("batch_%d" % batch_size, batch)):
+        sk = _best_of(lambda: model.predict_proba(rows), repeats)
+        fast = _best_of(lambda: compiled.predict_proba(rows), repeats)
+        report[label] = {"sklearn_ms": sk * 1e3, "compiled_ms": fast * 1e3, "speedup": sk / fast}
+
+    expected = model.predict_proba(X)
+    actual = compiled.predict_proba(X)
+    report["rows_checked"] = len(X)
+    report["bit_identical"] = bool(np.array_equal(expected, actual))
+    report["max_abs_diff"] = float(np.abs(expected - actual).max())
+    return report
+
+
+def _without_feature_names(model):
+    import copy
+    clone = copy.copy(model)
+    del clone.feature_names_in_
+    # Sequential accumulation keeps sklearn's own sum order deterministic
+    clone.n_jobs = 1
+    return clone
+
+
+if __name__ == "__main__":
+    import joblib
+    from data_cache import load_dataset
+    from scoring import encode_frame, feature_columns
+
+    model_path = sys.argv[1] if len(sys.argv) > 1 else "rf_student_engagement_model.pkl"
+    data_path = sys.argv[2] if len(sys.argv) > 2 else "Hackathon_Cleaned.xlsx"
+
+    model, le_dict = joblib.load(model_path)
+    df = load_dataset(data_path)
+    X = encode_frame(df, le_dict, feature_columns(model, df)).to_numpy(dtype=np.float32)
+
+    start = time.perf_counter()
+    compiled = compile_forest(model)
+    print(f"Compiled {compiled.n_trees} trees ({len(compiled.feature):,} nodes) "
+          f"in {time.perf_counter() - start:.2f}s")
+
+    for key, val in benchmark(model, X, compiled).items():
+        if isinstance(val, dict):
+            print(f"{key:>12}: sklearn {val['sklearn_ms']:.3f} ms | "
+                  f"compiled {val['compiled_ms']:.3f} ms | x{val['speedup']:.1f}")
+        else:
+            print(f"{key:>12}: {val}")
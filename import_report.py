@@ -0,0 +1,136 @@
+# ================================================
+# 🚀 Startup Import Report
+# ================================================
+# Breaks an app's startup time down by import. Module-level imports are
+# paid by every fresh session before the first paint; imports nested in a
+# panel or function are only paid when that code runs, so each of those is
+# measured on top of the module-level set.
+#
+#   python import_report.py                 (streamlit.py)
+#   python import_report.py ff.py
+
+import argparse
+import ast
+import os
+import subprocess
+import sys
+import tempfile
+
+
+MARKER = "@@import_report@@"
+
+
+def collect_imports(path):
+    """(eager, lazy): module-level imports vs imports nested anywhere else.
+    lazy is a list of (module, where) pairs."""
+    with open(path, encoding="utf-8") as fh:
+        tree = ast.parse(fh.read(), filename=path)
+
+    def modules(node):
+        if isinstance(node, ast.Import):
+            return [alias.name for alias in node.names]
+        if isinstance(node, ast.ImportFrom) and node.level == 0:
+            return [node.module]
+        return []
+
+    eager, top_level = [], set()
+    for node in tree.body:
+        for name in modules(node):
+            top_level.add(id(node))
+            if name not in eager:
+                eager.append(name)
+
+    lazy = []
+
+    def visit(node, where):
+        for child in ast.iter_child_nodes(node):
+            label = where
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                label = f"def {child.name}()"
+            elif isinstance(child, ast.If) and where == "module":
+                label = f"if {ast.unparse(child.test)[:40]}"
+            if id(child) not in top_level:
+                for name in modules(child):
+                    if name not in eager and all(name != m for m, _ in lazy):
+                        lazy.append((name, label))
+            visit(child, label)
+
+    visit(tree, "module")
+    return eager, lazy
+
+
+def _guarded_import(module, marker=True):
+    lines = [f"sys.stderr.write({MARKER + module!r} + '\\n'); sys.stderr.flush()"] if marker else []
+    lines.append(f"try:\n    import {module}\nexcept Exception:\n"
+                 f"    sys.stderr.write('{MARKER}!{module}' + '\\n')")
+    return lines
+
+
+def measure(modules, preload=(), root=".", app_module=None):
+    """Cumulative import time (ms) of each module, in order, after preload,
+    in a fresh interpreter (None when the import fails). The repo root is
+    appended to sys.path only after modules named like the app itself are
+    imported, so a local streamlit.py does not shadow the real package."""
+    shadowed = lambda m: app_module is not None and m.split(".")[0] == app_module
+    lines = ["import sys"]
+    for m in preload:
+        if shadowed(m):
+            lines += _guarded_import(m, marker=False)
+    for m in modules:
+        if shadowed(m):
+            lines += _guarded_import(m)
+    lines.append(f"sys.path.append({os.path.abspath(root)!r})")
+    for m in preload:
+        if not shadowed(m):
+            lines += _guarded_import(m, marker=False)
+    for m in modules:
+        if not shadowed(m):
+            lines += _guarded_import(m)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "\n".join(lines)],
+                          capture_output=True, text=True, cwd=tempfile.gettempdir())
+
+    results, current = {}, None
+    for line in proc.stderr.splitlines():
+        if line.startswith(MARKER + "!"):
+            failed = line[len(MARKER) + 1:]
+            if failed in results:
+                results[failed] = None
+        elif line.startswith(MARKER):
+            current = line[len(MARKER):]
+            results[current] = 0.0
+        elif current is not None and results.get(current) is not None and line.startswith("import time:"):
+            _, _, name = line.rsplit("|", 2)
+            if not name.startswith("  "):  # top-level entry of this statement
+                results[current] += int(line.split("|")[1]) / 1000
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import-time breakdown of an app's startup.")
+    parser.add_argument("app", nargs="?", default="streamlit.py")
+    args = parser.parse_args(argv)
+
+    root = os.path.dirname(os.path.abspath(args.app))
+    eager, lazy = collect_imports(args.app)
+
+    app_module = os.path.splitext(os.path.basename(args.app))[0]
+    eager_ms = measure(eager, root=root, app_module=app_module)
+    loaded = [m for m in eager if eager_ms.get(m) is not None]
+    lazy_ms = {m: measure([m], preload=loaded, root=root, app_module=app_module).get(m) for m, _ in lazy}
+
+    def fmt(ms):
+        return "not installed" if ms is None else f"{ms:9.1f} ms"
+
+    print(f"Module-level imports in {args.app} (paid before first paint):")
+    for m in sorted(eager, key=lambda m: -(eager_ms.get(m) or 0)):
+        print(f"  {m:<32} {fmt(eager_ms.get(m))}")
+    print(f"  {'total':<32} {sum(v or 0 for v in eager_ms.values()):9.1f} ms")
+
+    if lazy:
+        print("\nDeferred imports (paid on first use, on top of the above):")
+        for m, where in sorted(lazy, key=lambda item: -(lazy_ms.get(item[0]) or 0)):
+            print(f"  {m:<32} {fmt(lazy_ms.get(m))}   [{where}]")
+
+
+if __name__ == "__main__":
+    main()
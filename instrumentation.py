@@ -0,0 +1,192 @@
+# ================================================
+# 🩺 Hot-Path Instrumentation
+# ================================================
+# Cheap per-stage timers for the Dashboard and Simulation reruns. Every
+# stage feeds a fixed-bucket latency histogram shared by the process, and
+# the current rerun's timings are kept per session thread for the debug
+# panel. Export as Prometheus text (textfile collector) or JSON lines.
+#
+#   with timer("gauge"): ...
+#   @timed("mongo_upsert")
+#   DASHBOARD_METRICS=0                      -> timers become no-ops
+#   DASHBOARD_METRICS_EXPORT=metrics.prom    -> periodic export (.prom or .jsonl)
+
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+
+
+# Seconds; the last bucket is +Inf
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "count", "sum", "max")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th observation."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class _Timer:
+    __slots__ = ("metrics", "stage", "start")
+
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Metrics:
+    """Process-wide stage histograms plus per-thread (= per-session rerun) timings."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, enabled=True, prefix="student_dashboard"):
+        self.buckets = buckets
+        self.enabled = enabled
+        self.prefix = prefix
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._last_export = 0.0
+
+    # === Recording ===
+    def observe(self, stage, seconds):
+        with self._lock:
+            hist = self._histograms.get(stage)
+            if hist is None:
+                hist = self._histograms[stage] = Histogram(self.buckets)
+            hist.observe(seconds)
+        rerun = getattr(self._local, "rerun", None)
+        if rerun is not None:
+            rerun[stage] = rerun.get(stage, 0.0) + seconds
+
+    def timer(self, stage):
+        return _Timer(self, stage) if self.enabled else _NULL_TIMER
+
+    def timed(self, stage=None):
+        def decorator(fn):
+            name = stage or fn.__name__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def begin_rerun(self):
+        """Start collecting this thread's stage timings; returns the start time."""
+        self._local.rerun = {}
+        return time.perf_counter()
+
+    def end_rerun(self, started, stage="rerun"):
+        """Record the whole rerun and return {stage: seconds} for it."""
+        if self.enabled:
+            self.observe(stage, time.perf_counter() - started)
+        return dict(getattr(self._local, "rerun", None) or {})
+
+    # === Reading / Export ===
+    def snapshot(self):
+        """{stage: {count, sum, max, p50, p95, p99}} in seconds."""
+        with self._lock:
+            return {
+                stage: {"count": h.count, "sum": h.sum, "max": h.max,
+                        "p50": h.quantile(0.5), "p95": h.quantile(0.95), "p99": h.quantile(0.99)}
+                for stage, h in sorted(self._histograms.items())
+            }
+
+    def to_prometheus(self):
+        name = f"{self.prefix}_stage_seconds"
+        lines = [f"# HELP {name} Wall time per dashboard stage.", f"# TYPE {name} histogram"]
+        with self._lock:
+            for stage, h in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, n in zip(h.buckets, h.counts):
+                    cumulative += n
+                    lines.append(f'{name}_bucket{{stage="{stage}",le="{bound:g}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {h.count}')
+                lines.append(f'{name}_sum{{stage="{stage}"}} {h.sum:.6f}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {h.count}')
+        return "\n".join(lines) + "\n"
+
+    def to_jsonl(self):
+        now = time.time()
+        return "".join(
+            json.dumps({"ts": now, "stage": stage, **stats}) + "\n" for stage, stats in self.snapshot().items()
+        )
+
+    def export(self, path):
+        """Overwrite a .prom file atomically, or append to a .jsonl file."""
+        if path.endswith(".jsonl"):
+            with open(path, "a") as fh:
+                fh.write(self.to_jsonl())
+            return
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as fh:
+            fh.write(self.to_prometheus())
+        os.replace(tmp, path)
+
+    def maybe_export(self, path, min_interval=15.0):
+        """export() at most once per min_interval seconds."""
+        now = time.monotonic()
+        if not path or now - self._last_export < min_interval:
+            return False
+        self._last_export = now
+        self.export(path)
+        return True
+
+
+METRICS = Metrics(enabled=os.environ.get("DASHBOARD_METRICS", "1") != "0")
+EXPORT_PATH = os.environ.get("DASHBOARD_METRICS_EXPORT", "")
+timer = METRICS.timer
+timed = METRICS.timed
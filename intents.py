@@ -0,0 +1,120 @@
+# ================================================
+# 💬 Chatbot Intent Engine
+# ================================================
+# One data-driven rule table shared by both apps, compiled into a single
+# case-insensitive regex with one named group per intent. A message is
+# scanned once; when several intents match, the earliest rule wins (the
+# same priority the old if/elif chains had).
+#
+#   python intents.py input_log.txt     -> per-intent hit rates and latency
+
+import random
+import re
+import sys
+import time
+
+
+MOTIVATIONAL_QUOTES = [
+    "Every expert was once a beginner. Keep going!",
+    "Consistency beats intensity — study a little every day.",
+    "Your effort today is your success tomorrow.",
+    "Believe you can, and you're halfway there.",
+]
+
+ACADEMIC_TIPS = [
+    "Try scheduling short, focused study sessions (Pomodoro method).",
+    "Join a peer study group or discussion circle.",
+    "Focus on weak areas first — use your risk report to guide priorities.",
+    "Ask your mentor for weekly progress feedback.",
+]
+
+# (intent, keywords, replies). A trailing "*" matches any word starting with
+# the keyword; other keywords must match a whole word. Order is priority.
+INTENT_RULES = [
+    ("attendance", ["attendance", "attend*", "absent*", "bunk*"],
+     ["Maintaining attendance above 75% reduces dropout risk. Plan your schedule effectively."]),
+    ("grades", ["cgpa", "gpa", "grade*", "marks", "exam*"],
+     ["Improving CGPA requires consistent review and practice. Seek mentor guidance."]),
+    ("motivation", ["motivat*", "demotivat*"], MOTIVATIONAL_QUOTES),
+    ("study", ["stud*", "focus*", "pomodoro"], ACADEMIC_TIPS),
+    ("help", ["help", "how"],
+     ["I can help you interpret your results or suggest improvement strategies."]),
+    ("greeting", ["hello", "hi", "hey", "namaste"],
+     ["Hello! Ask me about attendance, grades, motivation or study strategies."]),
+    ("out_of_scope", ["order*", "book*", "cab", "pizza*", "food", "zomato", "swiggy",
+                      "whatsapp", "send", "message*", "call"],
+     ["I'm an academic assistant, so I can't do that. Ask me about attendance, grades or study plans."]),
+]
+FALLBACK_INTENT = "fallback"
+FALLBACK_REPLIES = ["Try being specific — ask about attendance, grades, or improvement strategies."]
+
+
+def _keyword_pattern(keyword):
+    if keyword.endswith("*"):
+        return re.escape(keyword[:-1]) + r"\w*"
+    return re.escape(keyword)
+
+
+def compile_rules(rules=INTENT_RULES):
+    """Single alternation regex with one named group per intent."""
+    groups = []
+    for i, (_, keywords, _) in enumerate(rules):
+        body = "|".join(_keyword_pattern(k) for k in keywords)
+        groups.append(f"(?P<r{i}>\\b(?:{body})\\b)")
+    return re.compile("|".join(groups), re.IGNORECASE)
+
+
+_MATCHER = compile_rules()
+
+
+def classify(text, rules=INTENT_RULES, matcher=_MATCHER):
+    """Intent name for a message (FALLBACK_INTENT when nothing matches)."""
+    best = len(rules)
+    for match in matcher.finditer(text):
+        best = min(best, int(match.lastgroup[1:]))
+        if best == 0:
+            break
+    return rules[best][0] if best < len(rules) else FALLBACK_INTENT
+
+
+_REPLIES = {intent: replies for intent, _, replies in INTENT_RULES}
+_REPLIES[FALLBACK_INTENT] = FALLBACK_REPLIES
+
+
+def reply_for(text):
+    """Chatbot reply for a message."""
+    return random.choice(_REPLIES[classify(text)])
+
+
+def classify_batch(lines):
+    """Classify many messages. Returns (intents, per-message seconds)."""
+    intents, latencies = [], []
+    for line in lines:
+        start = time.perf_counter()
+        intents.append(classify(line))
+        latencies.append(time.perf_counter() - start)
+    return intents, latencies
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    path = argv[0] if argv else "input_log.txt"
+    with open(path, encoding="utf-8", errors="replace") as fh:
+        lines = [line.strip() for line in fh if line.strip()]
+
+    intents, latencies = classify_batch(lines)
+    total = len(lines)
+    print(f"{total} messages from {path}")
+    for intent in [r[0] for r in INTENT_RULES] + [FALLBACK_INTENT]:
+        hits = intents.count(intent)
+        print(f"{intent:>13}: {hits:5d}  ({hits / max(total, 1):6.1%})")
+
+    latencies = sorted(latencies)
+    if latencies:
+        p50 = latencies[len(latencies) // 2] * 1e6
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1e6
+        print(f"latency: mean {sum(latencies) / total * 1e6:.1f} µs | p50 {p50:.1f} µs | p99 {p99:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
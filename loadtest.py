@@ -0,0 +1,135 @@
+# ================================================
+# 📈 Load Test for serve.py
+# ================================================
+# Fires concurrent single-student /score requests over keep-alive
+# connections and reports p50/p99 latency and throughput.
+#
+#   python loadtest.py --url http://127.0.0.1:8765       (running server)
+#   python loadtest.py --compare                         (spawns serve.py with
+#                                                         and without batching)
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from urllib.parse import urlparse
+
+import numpy as np
+
+
+def sample_students(data_path, n):
+    from data_cache import load_dataset
+    df = load_dataset(data_path).drop(columns=["dropout"], errors="ignore").head(n)
+    return json.loads(df.to_json(orient="records"))
+
+
+async def _client(host, port, bodies, latencies, remaining):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            body = bodies[remaining[0] % len(bodies)]
+            request = (
+                f"POST /score HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n"
+            ).encode("latin-1") + body
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            length = 0
+            status = await reader.readline()
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            if b" 200 " not in status:
+                raise RuntimeError(status.decode().strip())
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def run_load(url, students, requests=2000, concurrency=64):
+    """Returns latency percentiles (ms) and throughput (requests/s)."""
+    parsed = urlparse(url)
+    bodies = [json.dumps({"student": s}).encode("utf-8") for s in students]
+    latencies = []
+    remaining = [requests]
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _client(parsed.hostname, parsed.port, bodies, latencies, remaining) for _ in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+    lat = np.array(latencies) * 1000
+    return {
+        "requests": len(lat),
+        "concurrency": concurrency,
+        "p50_ms": float(np.percentile(lat, 50)),
+        "p99_ms": float(np.percentile(lat, 99)),
+        "throughput_rps": len(lat) / elapsed,
+    }
+
+
+def _wait_for_port(host, port, timeout=120):
+    import socket
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError(f"server on {host}:{port} did not start")
+
+
+def run_spawned(label, serve_args, students, args):
+    port = args.port
+    cmd = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "serve.py"),
+           "--port", str(port), "--model", args.model, "--data", ""] + serve_args
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL)
+    try:
+        _wait_for_port("127.0.0.1", port)
+        result = asyncio.run(run_load(f"http://127.0.0.1:{port}", students, args.requests, args.concurrency))
+    finally:
+        proc.terminate()
+        proc.wait()
+    result["config"] = label
+    return result
+
+
+def _print(result):
+    print(f"{result.get('config', 'server'):>16}: {result['requests']} req @ {result['concurrency']} conc | "
+          f"p50 {result['p50_ms']:.1f} ms | p99 {result['p99_ms']:.1f} ms | "
+          f"{result['throughput_rps']:.0f} req/s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the scoring service.")
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--data", default="Hackathon_Cleaned.xlsx")
+    parser.add_argument("--model", default="rf_student_engagement_model.pkl")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--compare", action="store_true", help="spawn serve.py with and without batching")
+    parser.add_argument("--port", type=int, default=8799, help="port for --compare")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    students = sample_students(args.data, 500)
+    if not args.compare:
+        _print(asyncio.run(run_load(args.url, students, args.requests, args.concurrency)))
+        return
+
+    _print(run_spawned("no batching", ["--max-batch", "1"], students, args))
+    _print(run_spawned("micro-batching", ["--max-batch", "64", "--max-wait-ms", str(args.max_wait_ms)],
+                       students, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# ================================================
+# 🎯 Cohort Intervention Planner
+# ================================================
+# For every high-risk student, finds the smallest change in attendance,
+# CGPA, study hours and assignments that brings the predicted risk below
+# the Dashboard thresholds (60% and 30%). Candidate perturbations are
+# applied to the encoded rows and scored in large predict_proba batches
+# spread across worker processes.
+#
+#   python planner.py --out interventions.csv
+
+import argparse
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from scoring import ID_COL, encode_frame, feature_columns
+
+
+# Lever -> (candidate increases, cap, effort of one "unit" of change)
+LEVERS = {
+    "attendance_rate": (np.arange(0, 41, 10), 100, 10.0),
+    "cgpa": (np.arange(0, 3.01, 0.5), 10, 1.0),
+    "study_hours_per_week": (np.arange(0, 16, 5), 168, 5.0),
+    "assignments_submitted": (np.arange(0, 21, 10), None, 10.0),
+}
+TARGETS = (60, 30)
+
+
+def candidate_deltas(levers=LEVERS):
+    """(n_candidates, n_levers) grid of increases and their effort cost."""
+    grid = np.array(list(itertools.product(*(steps for steps, _, _ in levers.values()))), dtype=float)
+    units = np.array([unit for _, _, unit in levers.values()])
+    return grid, (grid / units).sum(axis=1)
+
+
+_worker_model = None
+
+
+def _init_worker(model):
+    global _worker_model
+    _worker_model = model
+    # One process per core already; keep each forest single-threaded
+    _worker_model.set_params(n_jobs=1)
+
+
+def _plan_chunk(args):
+    """Worker: best intervention per target for a block of students."""
+    X_base, columns, lever_idx, caps, deltas, cost = args
+    n_students, n_cand = len(X_base), len(deltas)
+
+    X = np.repeat(X_base, n_cand, axis=0)
+    tiled = np.tile(deltas, (n_students, 1))
+    for j, col in enumerate(lever_idx):
+        X[:, col] += tiled[:, j]
+        if caps[j] is not None:
+            X[:, col] = np.minimum(X[:, col], caps[j])
+    X = pd.DataFrame(X, columns=columns)
+    risk = (_worker_model.predict_proba(X)[:, 1] * 100).reshape(n_students, n_cand)
+
+    results = []
+    for target in TARGETS:
+        # Cheapest candidate under the target; ties go to the lower risk
+        ok = risk < target
+        score = np.where(ok, cost[None, :] * 1000 + risk / 100, np.inf)
+        best = score.argmin(axis=1)
+        found = ok[np.arange(n_students), best]
+        results.append((best, found, risk[np.arange(n_students), best]))
+    return results
+
+
+def plan_interventions(df, model, le_dict, risk, min_risk=60, levers=LEVERS,
+                       processes=None, block_size=64):
+    """Ranked intervention table for students with risk >= min_risk."""
+    columns = feature_columns(model, df)
+    high = np.flatnonzero(np.asarray(risk) >= min_risk)
+    students = df.iloc[high]
+    X_base = encode_frame(students, le_dict, columns).to_numpy(dtype=float)
+
+    deltas, cost = candidate_deltas(levers)
+    lever_names = list(levers)
+    lever_idx = [columns.index(c) for c in lever_names]
+    caps = [cap for _, cap, _ in levers.values()]
+
+    blocks = [(X_base[i:i + block_size], columns, lever_idx, caps, deltas, cost)
+              for i in range(0, len(X_base), block_size)]
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(model,)) as pool:
+        parts = list(pool.map(_plan_chunk, blocks))
+
+    table = pd.DataFrame({
+        ID_COL: students[ID_COL].to_numpy(),
+        "department": students["department"].astype(str).to_numpy(),
+        "risk_probability": np.asarray(risk)[high],
+    })
+    for t, target in enumerate(TARGETS):
+        best = np.concatenate([p[t][0] for p in parts]) if parts else np.array([], dtype=int)
+        found = np.concatenate([p[t][1] for p in parts]) if parts else np.array([], dtype=bool)
+        new_risk = np.concatenate([p[t][2] for p in parts]) if parts else np.array([])
+        for j, name in enumerate(lever_names):
+            table[f"below_{target}_{name}_delta"] = np.where(found, deltas[best, j], np.nan)
+        table[f"below_{target}_risk"] = np.where(found, new_risk, np.nan)
+        table[f"below_{target}_effort"] = np.where(found, cost[best], np.nan)
+
+    # Cheapest wins first within each department; unreachable students last
+    first = f"below_{TARGETS[0]}_effort"
+    table = table.sort_values(["department", first, "risk_probability"],
+                              ascending=[True, True, False], na_position="last")
+    table["rank_in_department"] = table.groupby("department").cumcount() + 1
+    return table.reset_index(drop=True)
+
+
+def main(argv=None):
+    import joblib
+    from data_cache import load_dataset
+    from scoring import score_cohort
+
+    parser = argparse.ArgumentParser(description="Plan minimal interventions for high-risk students.")
+    parser.add_argument("--data", default="Hackathon_Cleaned.xlsx")
+    parser.add_argument("--model", default="rf_student_engagement_model.pkl")
+    parser.add_argument("--min-risk", type=float, default=60)
+    parser.add_argument("--out", default="interventions.csv")
+    parser.add_argument("--split-dir", default=None, help="also write one CSV per department here")
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    model, le_dict = joblib.load(args.model)
+    df = load_dataset(args.data)
+    risk = score_cohort(df, model, le_dict).to_numpy()
+    table = plan_interventions(df, model, le_dict, risk, args.min_risk, processes=args.processes)
+    table.to_csv(args.out, index=False)
+    if args.split_dir:
+        os.makedirs(args.split_dir, exist_ok=True)
+        for dept, part in table.groupby("department"):
+            part.to_csv(os.path.join(args.split_dir, f"interventions_{dept}.csv"), index=False)
+    print(f"Planned {len(table):,} students in {time.perf_counter() - start:.1f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
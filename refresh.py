@@ -0,0 +1,243 @@
+# ================================================
+# 🔄 Incremental Model Refresh
+# ================================================
+# The apps used to pick between "load pickle" and "full retrain" only on
+# whether the pickle existed, so new semesters were never picked up.
+# Here the training data is fingerprinted next to the model:
+#
+#   unchanged -> nothing to do
+#   appended  -> warm-start extra trees on the new rows only
+#   changed   -> full retrain (train.train_model)
+#
+# The new model is written to a unique temp file and swapped in with
+# os.replace, so readers always see either the old or the new pickle.
+# Every replica's watcher, refresh.py --watch and a first-run training
+# share one lock file next to the model, so only one of them retrains
+# (and uses the training checkpoint) at a time; the others skip a round.
+#
+#   python refresh.py [--watch SECONDS]
+
+import argparse
+import copy
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import joblib
+import pandas as pd
+
+from data_cache import load_dataset, replace_atomically
+from feature_schema import TARGET_COL, UNSEEN, FeatureSchema, feature_columns
+
+
+FINGERPRINT_SUFFIX = ".fingerprint.json"
+LOCK_SUFFIX = ".lock"
+# A lock file older than this was left by a process that died mid-refresh
+STALE_LOCK_S = 6 * 3600
+# Smallest number of trees added for an appended batch
+MIN_NEW_TREES = 10
+
+
+def _digest(hashes):
+    return hashlib.sha1(hashes.tobytes()).hexdigest()
+
+
+def row_hashes(df):
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def fingerprint(df):
+    return {"n_rows": int(len(df)), "columns": list(df.columns), "digest": _digest(row_hashes(df))}
+
+
+def fingerprint_path(model_path):
+    return model_path + FINGERPRINT_SUFFIX
+
+
+def load_fingerprint(model_path):
+    path = fingerprint_path(model_path)
+    if not os.path.exists(path):
+        return None
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def save_fingerprint(model_path, fp):
+    def write(tmp_path):
+        with open(tmp_path, "w") as fh:
+            json.dump(fp, fh)
+    replace_atomically(fingerprint_path(model_path), write)
+
+
+@contextmanager
+def model_lock(model_path, timeout=0.0, poll=1.0):
+    """Exclusive lock file next to the model, shared by every process that
+    may rewrite it. Yields True once held, or False after `timeout` seconds."""
+    path = model_path + LOCK_SUFFIX
+    deadline = time.monotonic() + timeout
+    fd = None
+    while fd is None:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                if time.time() - os.stat(path).st_mtime > STALE_LOCK_S:
+                    os.remove(path)
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(poll)
+    if fd is None:
+        yield False
+        return
+    try:
+        os.write(fd, f"{os.getpid()}\n".encode("ascii"))
+        os.close(fd)
+        yield True
+    finally:
+        os.remove(path)
+
+
+def detect_change(df, fp):
+    """Compare df with a stored fingerprint -> (status, appended rows or None)."""
+    if fp is None or fp["columns"] != list(df.columns):
+        return "changed", None
+    hashes = row_hashes(df)
+    n_old = fp["n_rows"]
+    if len(df) == n_old and _digest(hashes) == fp["digest"]:
+        return "unchanged", None
+    if len(df) > n_old and _digest(hashes[:n_old]) == fp["digest"]:
+        return "appended", df.iloc[n_old:]
+    return "changed", None
+
+
+def grow_forest(model, le_dict, delta, n_seen):
+    """Copy of model with extra warm-started trees fitted on the delta rows.
+
+    Returns None when the delta cannot be handled incrementally (unseen
+    categories, or not every class present).
+    """
+    schema = FeatureSchema(feature_columns(model), le_dict)
+    X = schema.frame(delta)
+    y = delta[TARGET_COL]
+    if (X[list(schema.lookups)] == UNSEEN).any().any():
+        return None
+    if set(y.unique()) != set(model.classes_):
+        return None
+
+    grown = copy.deepcopy(model)
+    n_trees = len(grown.estimators_)
+    extra = max(MIN_NEW_TREES, math.ceil(n_trees * len(delta) / max(n_seen, 1)))
+    grown.set_params(warm_start=True, n_estimators=n_trees + extra)
+    grown.fit(X, y)
+    grown.set_params(warm_start=False)
+    return grown
+
+
+def save_model(model, le_dict, model_path, fp):
+    """Atomically replace the pickle, then record the data it was trained on."""
+    replace_atomically(model_path, lambda tmp: joblib.dump((model, le_dict), tmp))
+    save_fingerprint(model_path, fp)
+
+
+def refresh(model_path, data_path, log=print):
+    """Bring model_path up to date with data_path. Returns the action taken,
+    or "busy" when another process holds the model lock."""
+    with model_lock(model_path) as acquired:
+        if not acquired:
+            log("Another process is refreshing the model; skipping this round")
+            return "busy"
+        return _refresh(model_path, data_path, log)
+
+
+def _refresh(model_path, data_path, log):
+    df = load_dataset(data_path)
+    fp = load_fingerprint(model_path)
+    if fp is None and os.path.exists(model_path):
+        # Legacy pickle without a fingerprint: adopt the current data
+        save_fingerprint(model_path, fingerprint(df))
+        log("Recorded fingerprint for existing model")
+        return "adopted"
+
+    status, delta = detect_change(df, fp)
+    if status == "unchanged":
+        return status
+
+    if status == "appended":
+        model, le_dict = joblib.load(model_path)
+        start = time.perf_counter()
+        grown = grow_forest(model, le_dict, delta, fp["n_rows"])
+        if grown is not None:
+            save_model(grown, le_dict, model_path, fingerprint(df))
+            log(f"Grew forest to {len(grown.estimators_)} trees on {len(delta):,} new rows "
+                f"in {time.perf_counter() - start:.1f}s")
+            return "grown"
+        log("New rows need a full retrain (unseen categories or missing classes)")
+
+    from train import train_model
+    model, le_dict, report = train_model(df, log=log)
+    save_model(model, le_dict, model_path, fingerprint(df))
+    log(f"Retrained on {len(df):,} rows (test accuracy {report['test_accuracy'] * 100:.2f}%)")
+    return "retrained"
+
+
+class RefreshWatcher:
+    """Background thread that runs refresh() every `interval` seconds.
+
+    The serving process keeps using its loaded model; it only needs to
+    reload when the pickle's mtime changes.
+    """
+
+    def __init__(self, model_path, data_path, interval=300, log=print):
+        self.model_path = model_path
+        self.data_path = data_path
+        self.interval = interval
+        self.log = log
+        self.last_status = None
+        self.last_error = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="model-refresh", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.last_status = refresh(self.model_path, self.data_path, log=self.log)
+                self.last_error = None
+            except Exception as exc:
+                self.last_error = repr(exc)
+
+
+def model_version(model_path):
+    """Changes whenever the pickle is swapped; use it as a cache key."""
+    return os.stat(model_path).st_mtime_ns if os.path.exists(model_path) else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Refresh the saved model when the training data changes.")
+    parser.add_argument("--model", default="rf_student_engagement_model.pkl")
+    parser.add_argument("--data", default="Hackathon_Cleaned.xlsx")
+    parser.add_argument("--watch", type=float, default=None, help="poll every N seconds")
+    args = parser.parse_args(argv)
+
+    while True:
+        print(refresh(args.model, args.data))
+        if args.watch is None:
+            break
+        time.sleep(args.watch)
+
+
+if __name__ == "__main__":
+    main()
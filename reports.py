@@ -0,0 +1,184 @@
+# ================================================
+# 📄 PDF Reports (single student and bulk ZIP)
+# ================================================
+# The stylesheet is built once per process and reportlab is only imported
+# when a PDF is actually built. Bulk mode renders a filtered cohort across
+# a pool of spawned processes and streams the PDFs into a ZIP archive. It
+# runs as its own process only: the Dashboard's "Build ZIP" shells out to
+# this CLI rather than starting a pool inside the Streamlit server.
+#
+#   python reports.py --department CS --level "High Risk" --out reports.zip
+
+import argparse
+import io
+import itertools
+import multiprocessing
+import os
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+from scoring import ID_COL, risk_levels
+
+
+PROFILE_FIELDS = ["student_id", "gender", "department", "cgpa", "attendance_rate", "family_income",
+                  "age", "scholarship", "sports_participation", "extra_curricular", "parental_education"]
+
+# Risk level -> (causes, recommendations) shown on the Dashboard and in reports
+RISK_ADVICE = {
+    "Low Risk": (
+        ["High CGPA", "Consistent attendance", "Active participation"],
+        ["Maintain study habits", "Engage in leadership roles"],
+    ),
+    "Moderate Risk": (
+        ["Moderate CGPA", "Inconsistent attendance", "Limited activity participation"],
+        ["Set weekly goals", "Join clubs", "Seek academic counseling"],
+    ),
+    "High Risk": (
+        ["Low CGPA", "Poor attendance", "Minimal activity participation"],
+        ["Mentorship & support", "Identify financial issues", "Personalized study plan"],
+    ),
+}
+
+
+@lru_cache(maxsize=1)
+def get_styles():
+    """getSampleStyleSheet() is rebuilt on every call; keep one per process."""
+    from reportlab.lib.styles import getSampleStyleSheet
+    return getSampleStyleSheet()
+
+
+def generate_pdf(student_display, risk_prob, risk_level, causes, recommendations):
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer)
+    styles = get_styles()
+    story = []
+
+    story.append(Paragraph("STUDENT ENGAGEMENT REPORT", styles['Title']))
+    story.append(Spacer(1, 12))
+    story.append(Paragraph("<b>Student Profile Overview</b>", styles['Heading2']))
+    for key in PROFILE_FIELDS:
+        story.append(Paragraph(f"{key.replace('_',' ').title()}: {student_display[key]}", styles['Normal']))
+    story.append(Spacer(1, 12))
+    story.append(Paragraph("<b>Risk Assessment Summary</b>", styles['Heading2']))
+    story.append(Paragraph(f"Dropout Probability: {round(risk_prob, 2)}%", styles['Normal']))
+    story.append(Paragraph(f"Risk Level: {risk_level}", styles['Normal']))
+    story.append(Spacer(1, 12))
+    story.append(Paragraph("<b>Identified Causes of Risk</b>", styles['Heading2']))
+    for c in causes:
+        story.append(Paragraph(f"• {c}", styles['Normal']))
+    story.append(Spacer(1, 12))
+    story.append(Paragraph("<b>Recommendations and Improvement Plan</b>", styles['Heading2']))
+    for r in recommendations:
+        story.append(Paragraph(f"• {r}", styles['Normal']))
+    story.append(Spacer(1, 24))
+    story.append(Paragraph("Generated by AI-Powered Student Engagement System", styles['Italic']))
+    doc.build(story)
+    buffer.seek(0)
+    return buffer
+
+
+def report_filename(student_id):
+    return f"Student_{int(student_id)}_Report.pdf"
+
+
+def _render_report(item):
+    """Worker: (profile dict, risk, level, causes) -> (file name, PDF bytes)."""
+    profile, risk_prob, risk_level, causes = item
+    default_causes, recommendations = RISK_ADVICE[risk_level]
+    pdf = generate_pdf(profile, risk_prob, risk_level, causes or default_causes, recommendations)
+    return report_filename(profile[ID_COL]), pdf.getvalue()
+
+
+def cohort_items(df, risk, departments=None, levels=None, explanation=None):
+    """Yield (profile, risk, level, causes) for students matching the filters.
+
+    risk (and explanation, if given) are aligned with df's rows, e.g.
+    CohortIndex.risk. Without an explanation the risk-band causes are used.
+    """
+    level = risk_levels(risk)
+    mask = np.ones(len(df), dtype=bool)
+    if departments:
+        mask &= df["department"].astype(str).isin(departments).to_numpy()
+    if levels:
+        mask &= np.isin(level, list(levels))
+    profiles = df[PROFILE_FIELDS]
+    for pos in mask.nonzero()[0]:
+        profile = profiles.iloc[pos].to_dict()
+        causes = explanation.describe(pos, df.iloc[pos]) if explanation is not None else None
+        yield profile, float(risk[pos]), level[pos], causes
+
+
+def _render_chunk(chunk):
+    return [_render_report(item) for item in chunk]
+
+
+def write_cohort_zip(items, out, processes=None, chunksize=8, max_pending=None):
+    """Render every item in a process pool, streaming PDFs into a ZIP.
+
+    out is a path or a writable binary file object. Returns the report count.
+    Meant for the CLI process (see main); do not call it from the Streamlit
+    server. At most max_pending chunks are in flight, so items is consumed
+    as the archive is written instead of being submitted up front.
+    """
+    processes = processes or os.cpu_count() or 1
+    max_pending = max_pending or 2 * processes
+    items = iter(items)
+    pending = deque()
+    count = 0
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=get_styles) as pool:
+            while True:
+                while len(pending) < max_pending:
+                    chunk = list(itertools.islice(items, chunksize))
+                    if not chunk:
+                        break
+                    pending.append(pool.submit(_render_chunk, chunk))
+                if not pending:
+                    break
+                # In submission order, so the archive order matches items
+                for name, pdf in pending.popleft().result():
+                    archive.writestr(name, pdf)
+                    count += 1
+    return count
+
+
+def main(argv=None):
+    import joblib
+    from data_cache import load_dataset
+    from explain import explain_cohort
+    from scoring import score_cohort
+
+    parser = argparse.ArgumentParser(description="Render PDF reports for a filtered cohort into a ZIP.")
+    parser.add_argument("--data", default="Hackathon_Cleaned.xlsx")
+    parser.add_argument("--model", default="rf_student_engagement_model.pkl")
+    parser.add_argument("--store", default="", help="read a shared_store.py directory instead of --data/--model")
+    parser.add_argument("--department", action="append", help="repeatable")
+    parser.add_argument("--level", action="append", choices=list(RISK_ADVICE), help="repeatable")
+    parser.add_argument("--out", default="reports.zip")
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    if args.store:
+        from shared_store import attach
+
+        snapshot = attach(args.store)
+        df, risk, explanation = snapshot.df, snapshot.risk, snapshot.explanation()
+    else:
+        model, le_dict = joblib.load(args.model)
+        df = load_dataset(args.data)
+        risk = score_cohort(df, model, le_dict).to_numpy()
+        explanation = explain_cohort(df, model, le_dict)
+    items = cohort_items(df, risk, args.department, args.level, explanation)
+    count = write_cohort_zip(items, args.out, processes=args.processes)
+    print(f"Wrote {count} reports to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
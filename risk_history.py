@@ -0,0 +1,122 @@
+# ================================================
+# 📉 Risk History (append-only, indexed)
+# ================================================
+# risk_records keeps only the latest document per student. Every saved
+# change is also appended here so the trajectory survives. Queries go to
+# whichever collection has an index that answers them:
+#
+#   risk_records (department, risk_probability desc) -> top-K at risk
+#   risk_history (student_id, timestamp) unique      -> per-student trend,
+#                                                       and retried batches
+#                                                       cannot duplicate entries
+#
+# Top-K ranks each student's latest saved risk, however old; a student
+# whose record has never been saved is not listed.
+#
+# Indexes are created on first use, so constructing a RiskHistory never
+# touches the network. Works against pymongo or mongomock collections.
+#
+#   python risk_history.py --department CS --k 20
+
+import argparse
+from datetime import datetime, timedelta
+
+import pandas as pd
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import BulkWriteError
+
+
+HISTORY_FIELDS = ["student_id", "timestamp", "risk_probability", "cgpa", "attendance_rate", "department"]
+DUPLICATE_KEY = 11000
+
+
+def _as_datetime(value):
+    if isinstance(value, datetime):
+        return value
+    return pd.Timestamp(value).to_pydatetime()
+
+
+class RiskHistory:
+    """collection: the append-only history; latest: risk_records (one
+    document per student), needed for top_k."""
+
+    def __init__(self, collection, latest=None, ensure_indexes=True):
+        self.collection = collection
+        self.latest = latest
+        self._indexed = not ensure_indexes
+
+    def ensure_indexes(self):
+        self.collection.create_index([("student_id", ASCENDING), ("timestamp", ASCENDING)],
+                                     name="student_timestamp", unique=True)
+        if self.latest is not None:
+            self.latest.create_index([("department", ASCENDING), ("risk_probability", DESCENDING)],
+                                     name="department_risk")
+        self._indexed = True
+
+    def _ready(self):
+        if not self._indexed:
+            self.ensure_indexes()
+        return self.collection
+
+    def append(self, records):
+        """Insert one history entry per record. Returns the number written;
+        entries already present (same student_id and timestamp) are skipped."""
+        docs = []
+        for rec in records:
+            doc = {k: rec[k] for k in HISTORY_FIELDS if k in rec}
+            doc["timestamp"] = _as_datetime(rec["timestamp"])
+            docs.append(doc)
+        if not docs:
+            return 0
+        try:
+            return len(self._ready().insert_many(docs, ordered=False).inserted_ids)
+        except BulkWriteError as exc:
+            errors = exc.details.get("writeErrors", [])
+            if any(e.get("code") != DUPLICATE_KEY for e in errors):
+                raise
+            return exc.details.get("nInserted", len(docs) - len(errors))
+
+    def top_k(self, department=None, k=100):
+        """The k riskiest students by their latest saved risk, riskiest first.
+        One indexed, limited scan of risk_records."""
+        if self.latest is None:
+            raise ValueError("top_k needs the risk_records collection (RiskHistory(..., latest=...))")
+        self._ready()
+        query = {} if department is None else {"department": department}
+        projection = {"_id": 0, **{f: 1 for f in HISTORY_FIELDS}}
+        cursor = self.latest.find(query, projection).sort(
+            [("risk_probability", DESCENDING), ("student_id", ASCENDING)]).limit(int(k))
+        top = pd.DataFrame(list(cursor), columns=HISTORY_FIELDS)
+        top["timestamp"] = pd.to_datetime(top["timestamp"])
+        return top
+
+    def trend(self, student_id, days=30, now=None):
+        """One student's risk entries over the last `days` days, oldest first."""
+        query = {"student_id": int(student_id)}
+        if days is not None:
+            query["timestamp"] = {"$gte": (now or datetime.now()) - timedelta(days=days)}
+        cursor = self._ready().find(query, {"_id": 0}).sort("timestamp", ASCENDING)
+        return pd.DataFrame(list(cursor), columns=HISTORY_FIELDS)
+
+
+def main(argv=None):
+    from pymongo import MongoClient
+
+    parser = argparse.ArgumentParser(description="Query the risk history collection.")
+    parser.add_argument("--uri", default="mongodb://localhost:27017")
+    parser.add_argument("--department", default=None)
+    parser.add_argument("--k", type=int, default=100)
+    parser.add_argument("--days", type=int, default=30, help="trend window")
+    parser.add_argument("--student", type=int, default=None, help="print this student's trend instead")
+    args = parser.parse_args(argv)
+
+    db = MongoClient(args.uri)["student_engagement"]
+    history = RiskHistory(db["risk_history"], latest=db["risk_records"])
+    if args.student is not None:
+        print(history.trend(args.student, args.days).to_string(index=False))
+    else:
+        print(history.top_k(args.department, args.k).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
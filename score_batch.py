@@ -0,0 +1,102 @@
+# ================================================
+# 🌙 Out-of-Core Batch Scoring
+# ================================================
+# Headless nightly scoring: streams a CSV or Parquet file in chunks
+# through the saved encoders and model and writes
+# student_id, risk_probability, risk_level with constant memory use.
+#
+#   python score_batch.py students.parquet --out risk_scores.csv
+
+import argparse
+import os
+import sys
+import time
+
+import joblib
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from feature_schema import ID_COL, FeatureSchema
+from scoring import predict_risk, risk_levels
+
+
+def iter_chunks(path, chunk_size):
+    """DataFrames of at most chunk_size rows from a CSV or Parquet file."""
+    if path.lower().endswith(".parquet"):
+        source = pq.ParquetFile(path)
+        for batch in source.iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+class ChunkWriter:
+    """Appends result chunks to a CSV or Parquet file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = path.lower().endswith(".parquet")
+        self._writer = None
+        self._header = True
+
+    def write(self, df):
+        if self.parquet:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode="w" if self._header else "a", header=self._header, index=False)
+            self._header = False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def score_file(src, out, model, le_dict, chunk_size=50_000, log=print):
+    """Score src chunk by chunk into out. Returns (rows, seconds)."""
+    schema = FeatureSchema.from_model(model, le_dict)
+    tmp_out = out + ".tmp" + os.path.splitext(out)[1]
+    writer = ChunkWriter(tmp_out)
+    rows = 0
+    start = time.perf_counter()
+    try:
+        for chunk in iter_chunks(src, chunk_size):
+            risk = predict_risk(model, schema.frame(chunk))
+            writer.write(pd.DataFrame({
+                ID_COL: chunk[ID_COL].to_numpy(),
+                "risk_probability": risk,
+                "risk_level": risk_levels(risk),
+            }))
+            rows += len(chunk)
+            elapsed = time.perf_counter() - start
+            log(f"{rows:,} rows | {rows / elapsed:,.0f} rows/s")
+    finally:
+        writer.close()
+    os.replace(tmp_out, out)
+    return rows, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a CSV/Parquet file of students in chunks.")
+    parser.add_argument("source")
+    parser.add_argument("--out", default="risk_scores.csv", help=".csv or .parquet")
+    parser.add_argument("--model", default="rf_student_engagement_model.pkl")
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--n-jobs", type=int, default=None, help="override the forest's n_jobs")
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    model, le_dict = joblib.load(args.model)
+    if args.n_jobs is not None:
+        model.set_params(n_jobs=args.n_jobs)
+
+    log = (lambda msg: None) if args.quiet else (lambda msg: print(msg, file=sys.stderr))
+    rows, seconds = score_file(args.source, args.out, model, le_dict, args.chunk_size, log)
+    print(f"Scored {rows:,} rows in {seconds:.2f}s ({rows / max(seconds, 1e-9):,.0f} rows/s) -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
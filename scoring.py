@@ -0,0 +1,71 @@
+# ================================================
+# ⚡ Cohort Scoring Helpers
+# ================================================
+# Shared by streamlit.py and the offline tools. Encodes a whole
+# DataFrame through the shared FeatureSchema and scores it in one
+# predict_proba call instead of one call per student.
+
+import numpy as np
+import pandas as pd
+
+from feature_schema import ID_COL, TARGET_COL, UNSEEN, FeatureSchema, feature_columns
+
+
+def encode_frame(df, le_dict, columns, unseen=UNSEEN):
+    """FeatureSchema(columns, le_dict).frame(df); compiles the lookups on
+    every call, so hold a FeatureSchema when encoding repeatedly."""
+    return FeatureSchema(columns, le_dict, unseen).frame(df)
+
+
+def predict_risk(model, X):
+    """Dropout probability in percent for every row of X."""
+    return model.predict_proba(X)[:, 1] * 100
+
+
+def score_cohort(df, model, le_dict):
+    """Score every student in df in one vectorized pass.
+
+    Returns a float Series of risk percentages indexed by student_id.
+    """
+    X = encode_frame(df, le_dict, feature_columns(model, df))
+    risk = predict_risk(model, X)
+    return pd.Series(risk, index=df[ID_COL].to_numpy(), name="risk_probability")
+
+
+# === Risk Bands (same cut-offs as the Dashboard gauge) ===
+RISK_LEVELS = ["Low Risk", "Moderate Risk", "High Risk"]
+
+
+def risk_levels(risk):
+    """Map risk percentages to Low (<30) / Moderate (<60) / High."""
+    codes = np.digitize(np.asarray(risk, dtype=float), [30, 60])
+    return np.asarray(RISK_LEVELS, dtype=object)[codes]
+
+
+class CohortIndex:
+    """student_id -> row position lookup plus the precomputed risk table."""
+
+    def __init__(self, df, risk):
+        ids = df[ID_COL].to_numpy()
+        self.positions = {int(sid): pos for pos, sid in enumerate(ids)}
+        self.risk = np.asarray(risk, dtype=float)
+        self.level = risk_levels(self.risk)
+        self.sorted_ids = sorted(self.positions)
+
+    def position(self, student_id):
+        return self.positions[int(student_id)]
+
+    def row(self, df, student_id):
+        return df.iloc[self.position(student_id)]
+
+    def risk_of(self, student_id):
+        return float(self.risk[self.position(student_id)])
+
+    def level_of(self, student_id):
+        return self.level[self.position(student_id)]
+
+
+def build_cohort_index(df, model, le_dict):
+    """Score the cohort once and index it by student_id."""
+    risk = score_cohort(df, model, le_dict)
+    return CohortIndex(df, risk.to_numpy())
@@ -0,0 +1,255 @@
+# ================================================
+# 🌐 Scoring HTTP Service (asyncio, micro-batching)
+# ================================================
+# Exposes the saved model to the LMS without Streamlit:
+#
+#   POST /score         {"student": {...}}  or  {"student_id": 205631}
+#   POST /score_batch   {"students": [{...}, {"student_id": 205631}, ...]}
+#   GET  /health
+#
+# Concurrent /score requests are queued and coalesced into one
+# predict_proba call once max_batch requests are waiting or max_wait_ms
+# has passed since the first one arrived.
+#
+#   python serve.py --port 8765 --max-batch 64 --max-wait-ms 5
+#   python serve.py --max-batch 1        (batching off)
+
+import argparse
+import asyncio
+import json
+import time
+
+import joblib
+import pandas as pd
+
+from feature_schema import ID_COL, TARGET_COL, FeatureSchema
+from scoring import predict_risk, risk_levels
+
+
+class Scorer:
+    """Model + encoders as loaded by load_or_train_model, plus an optional
+    student_id lookup into the dataset."""
+
+    def __init__(self, model, le_dict, df=None):
+        self.model = model
+        self.le_dict = le_dict
+        self.schema = FeatureSchema.from_model(model, le_dict)
+        self.df = df
+        self.positions = {int(s): i for i, s in enumerate(df[ID_COL])} if df is not None else None
+
+    def lookup(self, student_id):
+        """Dataset record of a known student_id."""
+        if self.positions is None:
+            raise ValueError("student_id lookups are disabled (server started without --data)")
+        try:
+            position = self.positions[int(student_id)]
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"unknown student_id {student_id!r}") from None
+        return self.df.iloc[position].drop(TARGET_COL, errors="ignore").to_dict()
+
+    def validate(self, student):
+        """Reject non-objects and records missing any model feature: absent
+        fields would silently go down the trees' missing-value branches.
+        That includes student_id when the model was trained on it."""
+        if not isinstance(student, dict):
+            raise ValueError("each student must be a JSON object")
+        missing = [c for c in self.schema.columns if c not in student]
+        if missing:
+            hint = (f" (this model was trained with {ID_COL} as a feature)"
+                    if ID_COL in missing else "")
+            raise ValueError(f"student record is missing fields: {', '.join(missing)}{hint}")
+        return student
+
+    def resolve(self, payload):
+        """Full student record from a /score body or a /score_batch entry:
+        {"student": {...}}, {"student_id": ...}, or (batch only) the record itself."""
+        if not isinstance(payload, dict):
+            raise ValueError("request body must be a JSON object")
+        if "student" in payload:
+            return self.validate(payload["student"])
+        if ID_COL in payload:
+            return self.lookup(payload[ID_COL])
+        raise ValueError("expected 'student' or 'student_id'")
+
+    def score(self, students):
+        # dict -> matrix directly; the DataFrame only carries feature names
+        X = pd.DataFrame(self.schema.rows(students), columns=self.schema.columns)
+        risk = predict_risk(self.model, X)
+        levels = risk_levels(risk)
+        return [
+            {ID_COL: None if s.get(ID_COL) is None else int(s[ID_COL]),
+             "risk_probability": float(r), "risk_level": str(level)}
+            for s, r, level in zip(students, risk, levels)
+        ]
+
+
+class MicroBatcher:
+    """Coalesces single-student requests into batched score() calls."""
+
+    def __init__(self, scorer, max_batch=64, max_wait_ms=5.0):
+        self.scorer = scorer
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, student):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((student, future))
+        return await future
+
+    def _score_one(self, student):
+        try:
+            return self.scorer.score([student])[0]
+        except Exception as exc:
+            return exc
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            students = [s for s, _ in batch]
+            try:
+                # Off the event loop so requests keep being accepted
+                results = await loop.run_in_executor(None, self.scorer.score, students)
+            except Exception:
+                # One bad record must not fail its neighbours: retry one by one
+                results = [await loop.run_in_executor(None, self._score_one, s) for s in students]
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+            self.batches += 1
+            self.items += len(batch)
+
+
+# === Minimal HTTP/1.1 handling ===
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}
+
+
+async def _read_request(reader):
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    body = await reader.readexactly(length) if length else b""
+    return method, path, headers, body
+
+
+def _response(status, payload, keep_alive):
+    body = json.dumps(payload).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+class ScoringService:
+    def __init__(self, scorer, batcher):
+        self.scorer = scorer
+        self.batcher = batcher
+
+    async def route(self, method, path, body):
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok", "batches": self.batcher.batches, "items": self.batcher.items}
+        if method != "POST" or path not in ("/score", "/score_batch"):
+            return 404, {"error": f"no route for {method} {path}"}
+        payload = json.loads(body or b"{}")
+        if path == "/score":
+            return 200, await self.batcher.submit(self.scorer.resolve(payload))
+        if not isinstance(payload, dict) or not isinstance(payload.get("students", []), list):
+            raise ValueError("expected {\"students\": [...]}")
+        students = [
+            self.scorer.resolve(s if isinstance(s, dict) and ("student" in s or set(s) == {ID_COL})
+                                else {"student": s})
+            for s in payload.get("students", [])
+        ]
+        loop = asyncio.get_running_loop()
+        return 200, {"results": await loop.run_in_executor(None, self.scorer.score, students)}
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    status, payload = await self.route(method, path, body)
+                except (KeyError, ValueError) as exc:
+                    status, payload = 400, {"error": str(exc)}
+                except Exception as exc:
+                    status, payload = 500, {"error": repr(exc)}
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(scorer, host="127.0.0.1", port=8765, max_batch=64, max_wait_ms=5.0):
+    batcher = MicroBatcher(scorer, max_batch=max_batch, max_wait_ms=max_wait_ms)
+    service = ScoringService(scorer, batcher)
+    worker = asyncio.create_task(batcher.run())
+    server = await asyncio.start_server(service.handle, host, port)
+    print(f"Scoring service on http://{host}:{port} (max_batch={max_batch}, max_wait={max_wait_ms} ms)",
+          flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        worker.cancel()
+
+
+def main(argv=None):
+    from data_cache import load_dataset
+
+    parser = argparse.ArgumentParser(description="Serve dropout-risk scores over HTTP.")
+    parser.add_argument("--model", default="rf_student_engagement_model.pkl")
+    parser.add_argument("--data", default="Hackathon_Cleaned.xlsx", help="for student_id lookups; '' to skip")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    model, le_dict = joblib.load(args.model)
+    df = load_dataset(args.data) if args.data else None
+    print(f"Loaded model in {time.perf_counter() - start:.2f}s", flush=True)
+    try:
+        asyncio.run(serve(Scorer(model, le_dict, df), args.host, args.port, args.max_batch, args.max_wait_ms))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+# ================================================
+# 🧠 Shared Model / Dataset Store (memory-mapped)
+# ================================================
+# One loader process publishes the compiled forest, the dataset columns,
+# the cohort risk table and the per-student explanations as .npy files in
+# a versioned directory, then flips the CURRENT pointer atomically.
+# Streamlit replicas attach read-only with np.load(mmap_mode="r"), so the
+# OS page cache holds a single copy however many replicas run, and a new
+# version is picked up on the next rerun without restarting anything.
+#
+#   python shared_store.py publish               # once
+#   python shared_store.py watch --interval 300  # refresh + republish on change
+#   STUDENT_SHARED_STORE=.cache/shared_store streamlit run streamlit.py
+#
+# store/
+#   CURRENT              -> "v1760000000000000000"
+#   v1760.../meta.json   forest/*.npy  data/*.npy  risk.npy  contributions.npy  le_dict.pkl
+
+import argparse
+import json
+import os
+import shutil
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from forest_compiler import CompiledForest, compile_forest
+
+
+STORE_DIR = os.path.join(".cache", "shared_store")
+CURRENT = "CURRENT"
+KEEP_VERSIONS = 3
+FOREST_ARRAYS = ("feature", "threshold", "left", "right", "missing_left", "value", "roots")
+
+
+def _save(path, array):
+    np.save(path, np.ascontiguousarray(array), allow_pickle=False)
+
+
+def _write_dataset(df, data_dir):
+    """One .npy per column; text columns as category codes + labels."""
+    columns = []
+    for i, col in enumerate(df.columns):
+        values = df[col]
+        entry = {"name": col, "file": f"c{i}.npy"}
+        if not pd.api.types.is_numeric_dtype(values.dtype):
+            cat = values.astype("category")
+            entry["categories"] = [str(c) for c in cat.cat.categories]
+            _save(os.path.join(data_dir, entry["file"]), cat.cat.codes.to_numpy())
+        else:
+            _save(os.path.join(data_dir, entry["file"]), values.to_numpy())
+        columns.append(entry)
+    return columns
+
+
+def current_version(store_dir=STORE_DIR):
+    """Version named by CURRENT, or None before the first publish."""
+    try:
+        with open(os.path.join(store_dir, CURRENT)) as fh:
+            return fh.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def publish(model, le_dict, df, store_dir=STORE_DIR, keep=KEEP_VERSIONS, log=print):
+    """Write a new version and point CURRENT at it. Returns the version."""
+    from explain import explain_cohort
+    from scoring import score_cohort
+
+    start = time.perf_counter()
+    version = f"v{time.time_ns()}"
+    tmp = os.path.join(store_dir, f".{version}.tmp")
+    os.makedirs(os.path.join(tmp, "forest"))
+    os.makedirs(os.path.join(tmp, "data"))
+
+    compiled = compile_forest(model)
+    for name in FOREST_ARRAYS:
+        _save(os.path.join(tmp, "forest", f"{name}.npy"), getattr(compiled, name))
+    explanation = explain_cohort(df, model, le_dict)
+    _save(os.path.join(tmp, "risk.npy"), score_cohort(df, model, le_dict).to_numpy(dtype=np.float64))
+    _save(os.path.join(tmp, "contributions.npy"), explanation.contributions)
+    joblib.dump(le_dict, os.path.join(tmp, "le_dict.pkl"))
+
+    meta = {
+        "version": version,
+        "created": time.time(),
+        "n_rows": len(df),
+        "columns": _write_dataset(df, os.path.join(tmp, "data")),
+        "max_depth": compiled.max_depth,
+        "feature_names": compiled.feature_names,
+        "explanation_columns": explanation.columns,
+        "bias": explanation.bias,
+    }
+    with open(os.path.join(tmp, "meta.json"), "w") as fh:
+        json.dump(meta, fh)
+
+    # Directory first, then the pointer: readers never see a partial version
+    os.rename(tmp, os.path.join(store_dir, version))
+    pointer = os.path.join(store_dir, f".{CURRENT}.tmp")
+    with open(pointer, "w") as fh:
+        fh.write(version)
+    os.replace(pointer, os.path.join(store_dir, CURRENT))
+    _prune(store_dir, keep)
+    log(f"Published {version} ({len(df):,} rows, {compiled.n_trees} trees) "
+        f"in {time.perf_counter() - start:.1f}s")
+    return version
+
+
+def _prune(store_dir, keep):
+    # Attached replicas keep their mappings even after the files are unlinked
+    versions = sorted(d for d in os.listdir(store_dir) if d.startswith("v"))
+    current = current_version(store_dir)
+    for old in versions[:-keep] if keep else []:
+        if old != current:
+            shutil.rmtree(os.path.join(store_dir, old), ignore_errors=True)
+
+
+class SharedSnapshot:
+    """Read-only, memory-mapped view of one published version."""
+
+    def __init__(self, path):
+        with open(os.path.join(path, "meta.json")) as fh:
+            meta = json.load(fh)
+        self.version = meta["version"]
+        load = lambda *parts: np.load(os.path.join(path, *parts), mmap_mode="r")
+
+        self.forest = CompiledForest(
+            **{name: load("forest", f"{name}.npy") for name in FOREST_ARRAYS},
+            max_depth=meta["max_depth"], feature_names=meta["feature_names"],
+        )
+        columns = {}
+        for entry in meta["columns"]:
+            values = load("data", entry["file"])
+            if "categories" in entry:
+                values = pd.Categorical.from_codes(values, entry["categories"])
+            columns[entry["name"]] = values
+        self.df = pd.DataFrame(columns, copy=False)
+        self.risk = load("risk.npy")
+        self.contributions = load("contributions.npy")
+        self.explanation_columns = meta["explanation_columns"]
+        self.bias = meta["bias"]
+        self.le_dict = joblib.load(os.path.join(path, "le_dict.pkl"))
+
+    def cohort(self):
+        from scoring import CohortIndex
+        return CohortIndex(self.df, self.risk)
+
+    def explanation(self):
+        from explain import CohortExplanation
+        return CohortExplanation(self.explanation_columns, self.contributions, self.bias)
+
+
+def attach(store_dir=STORE_DIR, version=None):
+    """Snapshot of `version` (default: CURRENT)."""
+    version = version or current_version(store_dir)
+    if version is None:
+        raise FileNotFoundError(f"nothing published in {store_dir}; run `python shared_store.py publish`")
+    return SharedSnapshot(os.path.join(store_dir, version))
+
+
+def main(argv=None):
+    from data_cache import load_dataset
+    from refresh import model_version, refresh
+
+    parser = argparse.ArgumentParser(description="Publish the model and dataset for Streamlit replicas.")
+    parser.add_argument("command", choices=["publish", "watch", "info"])
+    parser.add_argument("--model", default="rf_student_engagement_model.pkl")
+    parser.add_argument("--data", default="Hackathon_Cleaned.xlsx")
+    parser.add_argument("--store", default=STORE_DIR)
+    parser.add_argument("--interval", type=float, default=300)
+    parser.add_argument("--keep", type=int, default=KEEP_VERSIONS)
+    args = parser.parse_args(argv)
+    os.makedirs(args.store, exist_ok=True)
+
+    if args.command == "info":
+        version = current_version(args.store)
+        print(f"CURRENT = {version}")
+        if version:
+            snap = attach(args.store, version)
+            print(f"{len(snap.df):,} rows, {snap.forest.n_trees} trees, "
+                  f"{len(snap.forest.value):,} nodes")
+        return
+
+    def publish_current():
+        model, le_dict = joblib.load(args.model)
+        publish(model, le_dict, load_dataset(args.data), args.store, args.keep)
+
+    if args.command == "publish":
+        publish_current()
+        return
+
+    last = None
+    while True:
+        refresh(args.model, args.data)
+        state = (model_version(args.model), os.stat(args.data).st_mtime_ns)
+        if state != last:
+            publish_current()
+            last = state
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
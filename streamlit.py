@@ -2,154 +2,282 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import joblib
-import plotly.graph_objects as go
-import random
-import io
 import os
-import matplotlib.pyplot as plt
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split, GridSearchCV
-from sklearn.preprocessing import LabelEncoder
-from sklearn.metrics import accuracy_score
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
+import time
+
+# Heavy modules (plotly, matplotlib, reportlab, pymongo, sklearn model
+# selection) are imported inside the panel or function that needs them.
+# `python import_report.py` shows what each one costs at startup.
+from analytics import DIMENSIONS, refresh_aggregates
+from data_cache import as_float, load_dataset
+from explain import explain_cohort
+from figure_cache import cache_info as figure_cache_info, gauge_figure, pie_figure, risk_bar_png
+from instrumentation import EXPORT_PATH, METRICS, timed, timer
+from intents import reply_for
+from refresh import RefreshWatcher, fingerprint, model_lock, model_version, save_model
+from scoring import RISK_LEVELS, build_cohort_index
+from what_if import ATTENDANCE_GRID, CGPA_GRID, RiskSurfaceEngine
+
+
+# === MongoDB Connection (created on first write, pooled per process) ===
+MONGO_URI = "mongodb://localhost:27017"  # or your Atlas URI
+
 
+@st.cache_resource
+def get_database():
+    from pymongo import MongoClient
+    # connect=False: no network I/O until the first write
+    client = MongoClient(MONGO_URI, maxPoolSize=20, connect=False, serverSelectionTimeoutMS=3000)
+    return client["student_engagement"]       # Database name
 
-from pymongo import MongoClient
 
-# === MongoDB Connection ===
-MONGO_URI = "mongodb://localhost:27017"  # or your Atlas URI
-client = MongoClient(MONGO_URI)
-db = client["student_engagement"]         # Database name
-collection = db["risk_records"]           # Collection name
+def get_collection():
+    return get_database()["risk_records"]     # Latest record per student
+
+
+@st.cache_resource
+def get_history():
+    """Append-only risk trajectory; top-K is read from risk_records
+    (indexes created on first use)."""
+    from risk_history import RiskHistory
+    return RiskHistory(get_database()["risk_history"], latest=get_collection())
+
+
+@st.cache_resource
+def get_write_buffer():
+    """One write-behind buffer per server process; flushes also feed the history."""
+    from write_buffer import WriteBehindBuffer
+    return WriteBehindBuffer(get_collection(), max_batch=100, flush_interval=2.0, history=get_history())
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def risk_trend(student_id, days=30):
+    return get_history().trend(student_id, days)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def top_at_risk(department, k=100):
+    return get_history().top_k(department, k)
+
+
+# st.cache_data does not cache exceptions, so with Mongo down every rerun
+# would wait out serverSelectionTimeoutMS again. After a failure the
+# history is skipped for HISTORY_RETRY_AFTER seconds.
+HISTORY_RETRY_AFTER = 60
+
+
+@st.cache_resource
+def get_history_breaker():
+    return {"until": 0.0, "error": None}
+
+
+def query_history(query, *args):
+    breaker = get_history_breaker()
+    if time.monotonic() < breaker["until"]:
+        raise ConnectionError(f"{breaker['error']} (retrying in {breaker['until'] - time.monotonic():.0f}s)")
+    try:
+        return query(*args)
+    except Exception as e:
+        breaker.update(until=time.monotonic() + HISTORY_RETRY_AFTER, error=str(e))
+        raise
 
 
 # === File Paths ===
 DATA_PATH = "Hackathon_Cleaned.xlsx"
 MODEL_PATH = "rf_student_engagement_model.pkl"
+# Set to a shared_store.py directory to attach to a published, memory-mapped
+# model/dataset instead of loading a private copy in every replica
+SHARED_STORE = os.environ.get("STUDENT_SHARED_STORE", "")
 
 
+@timed("mongo_upsert")
 def save_student_record(student_id, risk_prob, student_display):
     """Save student engagement data in MongoDB."""
     record = {
         "student_id": int(student_id),
         "risk_probability": float(risk_prob),
-        "cgpa": float(student_display["cgpa"]),
-        "attendance_rate": float(student_display["attendance_rate"]),
+        "cgpa": as_float(student_display["cgpa"]),
+        "attendance_rate": as_float(student_display["attendance_rate"]),
         "department": str(student_display["department"]),
         "gender": str(student_display["gender"]),
-        "family_income": float(student_display["family_income"]),
+        "family_income": as_float(student_display["family_income"]),
         "timestamp": pd.Timestamp.now().isoformat()
     }
 
-    # Insert or update record
-    collection.update_one(
-        {"student_id": record["student_id"]},
-        {"$set": record},
-        upsert=True
-    )
-    st.success("✅ Student record saved to MongoDB successfully!")
+    # Queue the upsert; unchanged records are skipped
+    if get_write_buffer().submit(record):
+        st.success("✅ Student record queued for MongoDB.")
+
+
+def build_cohort_zip(departments, levels):
+    """Bulk reports via `python reports.py` in its own process.
+
+    The report pool cannot be started from here: forked workers can
+    deadlock on locks held by the server's threads, and spawned ones
+    re-run the launcher with this directory first on sys.path, where
+    streamlit.py shadows the streamlit package. Returns (count, ZIP bytes).
+    """
+    import subprocess
+    import sys
+    import tempfile
+    import zipfile
+
+    fd, out = tempfile.mkstemp(suffix=".zip")
+    os.close(fd)
+    cmd = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "reports.py"),
+           "--data", DATA_PATH, "--model", MODEL_PATH, "--out", out]
+    if SHARED_STORE:
+        cmd += ["--store", SHARED_STORE]
+    for department in departments:
+        cmd += ["--department", department]
+    for level in levels:
+        cmd += ["--level", level]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            lines = result.stderr.strip().splitlines()
+            raise RuntimeError(lines[-1] if lines else f"reports.py exited with {result.returncode}")
+        with zipfile.ZipFile(out) as archive:
+            count = len(archive.namelist())
+        with open(out, "rb") as fh:
+            return count, fh.read()
+    finally:
+        os.remove(out)
 
 
 # === Streamlit Config ===
 st.set_page_config(page_title="Student Engagement Dashboard", layout="wide")
+rerun_started = METRICS.begin_rerun()
 st.sidebar.header("Navigation")
-menu = st.sidebar.selectbox("Select Panel", ["📊 Dashboard", "🧮 Simulation Panel"])
+menu = st.sidebar.selectbox("Select Panel", ["📊 Dashboard", "🧮 Simulation Panel", "🏫 Cohort Analytics"],
+                            key="menu")
 
 # === Load or Train Model ===
+# Keyed by the pickle's mtime: a refreshed model is picked up on the next
+# rerun while the previous one keeps serving until then.
+def train_first_model():
+    """Train and save the initial model. Replicas starting together queue on
+    the model lock; the ones behind the first just load what it saved."""
+    from train import train_model
+
+    with model_lock(MODEL_PATH, timeout=3600) as acquired:
+        if os.path.exists(MODEL_PATH):
+            return
+        if not acquired:
+            raise TimeoutError(f"timed out waiting for another process to train {MODEL_PATH}")
+        st.info("⚙️ Training model for the first time... please wait (only once).")
+        df_original = load_dataset(DATA_PATH)
+
+        # Successive halving over warm-started forests (resumes from checkpoint)
+        progress = st.empty()
+        model, le_dict, report = train_model(df_original, log=progress.text)
+        progress.empty()
+        st.success(f"Model trained with Accuracy: {report['test_accuracy'] * 100:.2f}%")
+
+        save_model(model, le_dict, MODEL_PATH, fingerprint(df_original))
+        st.success("✅ Model saved! Future loads will be instant.")
+
+
+@st.cache_resource(max_entries=1)
+def load_or_train_model(version):
+    if not os.path.exists(MODEL_PATH):
+        train_first_model()
+    model, le_dict = joblib.load(MODEL_PATH)
+    df = load_dataset(DATA_PATH)
+    cohort = build_cohort_index(df, model, le_dict)
+    explanation = explain_cohort(df, model, le_dict)
+    st.success("✅ Pre-trained model loaded successfully!")
+    return model, df, le_dict, cohort, explanation
+
+# Keyed by the store's CURRENT pointer: a republished version is attached on
+# the next rerun. `model` is then the compiled forest (read-only arrays).
+@st.cache_resource(max_entries=1)
+def attach_shared_store(version):
+    from shared_store import attach
+
+    snapshot = attach(SHARED_STORE, version)
+    return snapshot.forest, snapshot.df, snapshot.le_dict, snapshot.cohort(), snapshot.explanation()
+
+# Load model (cohort = student_id index + precomputed risk table,
+# explanation = per-student feature contributions)
+if SHARED_STORE:
+    from shared_store import current_version as shared_version
+
+    current_version = shared_version(SHARED_STORE)
+    with timer("load_model"):
+        model, df_display, le_dict, cohort, explanation = attach_shared_store(current_version)
+else:
+    current_version = model_version(MODEL_PATH)
+    with timer("load_model"):
+        model, df_display, le_dict, cohort, explanation = load_or_train_model(current_version)
+
+
+# === Background Refresh (warm-starts new rows, retrains on edits) ===
 @st.cache_resource
-def load_or_train_model():
-    if os.path.exists(MODEL_PATH):
-        model, le_dict = joblib.load(MODEL_PATH)
-        df = pd.read_excel(DATA_PATH)
-        st.success("✅ Pre-trained model loaded successfully!")
-        return model, df.copy(), df, le_dict
-
-    st.info("⚙️ Training model for the first time... please wait (only once).")
-    df = pd.read_excel(DATA_PATH)
-    df_original = df.copy()
-
-    # Encode categorical columns
-    le_dict = {}
-    for col in df.select_dtypes(include=["object"]).columns:
-        le = LabelEncoder()
-        df[col] = le.fit_transform(df[col].astype(str))
-        le_dict[col] = le
-
-    X = df.drop("dropout", axis=1)
-    y = df["dropout"]
-
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-    param_grid = {
-        'n_estimators': [150, 250],
-        'max_depth': [10, None],
-        'min_samples_split': [2, 5],
-        'min_samples_leaf': [1, 2]
-    }
+def start_refresh_watcher():
+    return RefreshWatcher(MODEL_PATH, DATA_PATH, interval=300).start()
+
+# With a shared store, `shared_store.py watch` refreshes and republishes
+if not SHARED_STORE:
+    start_refresh_watcher()
+
+
+# === Cohort Aggregates (built once, then updated for changed students) ===
+@st.cache_resource
+def get_aggregate_holder():
+    return {"aggregates": None}
+
+
+@timed("cohort_aggregates")
+def cohort_aggregates():
+    holder = get_aggregate_holder()
+    holder["aggregates"] = refresh_aggregates(holder["aggregates"], df_display, cohort.risk, current_version)
+    return holder["aggregates"]
 
-    base_model = RandomForestClassifier(random_state=42, n_jobs=-1)
-    grid_search = GridSearchCV(base_model, param_grid, cv=2, n_jobs=-1)
-    grid_search.fit(X_train, y_train)
-    model = grid_search.best_estimator_
 
-    y_pred = model.predict(X_test)
-    acc = accuracy_score(y_test, y_pred) * 100
-    st.success(f"Model trained with Accuracy: {acc:.2f}%")
+def open_in_dashboard(student_id):
+    """Drill-down: switch to the Dashboard with this student selected."""
+    st.session_state.menu = "📊 Dashboard"
+    st.session_state.student_picker = int(student_id)
 
-    joblib.dump((model, le_dict), MODEL_PATH)
-    st.success("✅ Model saved! Future loads will be instant.")
-    return model, df_original, df, le_dict
 
-# Load model
-model, df_display, df_encoded, le_dict = load_or_train_model()
+# === What-If Surfaces (one batched prediction per student) ===
+@st.cache_resource(max_entries=1)
+def get_surface_engine(version):
+    return RiskSurfaceEngine(model, le_dict, maxsize=64)
 
 
-# === Helper: Encode input with saved LabelEncoders ===
-def encode_input(df_row, le_dict):
-    """Ensures all categorical fields are converted to numeric using trained LabelEncoders."""
-    encoded_row = df_row.copy()
-    for col, le in le_dict.items():
-        if col in encoded_row.index:
-            val = encoded_row[col]
-            if isinstance(val, str):
-                if val in le.classes_:
-                    encoded_row[col] = le.transform([val])[0]
-                else:
-                    # Handle unseen category by mapping to a default value (first class)
-                    encoded_row[col] = 0
-    return encoded_row
+@timed("risk_surface")
+def student_surface(student_id):
+    student = cohort.row(df_display, student_id).drop("dropout", errors="ignore")
+    return get_surface_engine(current_version).surface(int(student_id), student)
 
 
 # === Simulation Function ===
-def simulate_risk(attendance, cgpa):
-    student_sim = df_display.iloc[0].copy()
-    student_sim['attendance_rate'] = attendance
-    student_sim['cgpa'] = cgpa
-    input_data = student_sim.drop('dropout', errors='ignore')
-    input_data = encode_input(input_data, le_dict)
-    input_df = pd.DataFrame([input_data])
-    return model.predict_proba(input_df)[0][1] * 100
+@timed("simulate")
+def simulate_risk(student_id, attendance, cgpa):
+    student = cohort.row(df_display, student_id).drop("dropout", errors="ignore")
+    return get_surface_engine(current_version).risk(int(student_id), student, attendance, cgpa)
 
 
 # ===============================
 # 📊 DASHBOARD PANEL
 # ===============================
 if menu == "📊 Dashboard":
+    import plotly.graph_objects as go
+    from reports import RISK_ADVICE, generate_pdf, report_filename
+
     st.title("🎓 Student Engagement & Dropout Risk Dashboard")
 
     # Sidebar - Student selection
     st.sidebar.header("🔍 Search Student")
-    student_ids = df_display["student_id"].unique()
-    selected_id = st.sidebar.selectbox("Select Student ID", student_ids)
+    selected_id = st.sidebar.selectbox("Select Student ID", cohort.sorted_ids, key="student_picker")
 
     st.session_state.selected_id = selected_id
 
-    student_display = df_display[df_display["student_id"] == selected_id].iloc[0]
-    student_encoded = encode_input(student_display.drop("dropout", errors="ignore"), le_dict)
-
-    input_df = pd.DataFrame([student_encoded])
-    risk_prob = model.predict_proba(input_df)[0][1] * 100
+    with timer("predict"):
+        student_display = cohort.row(df_display, selected_id)
+        risk_prob = cohort.risk_of(selected_id)
     save_student_record(selected_id, risk_prob, student_display)
 
 
@@ -163,8 +291,8 @@ if menu == "📊 Dashboard":
         st.metric("Department", str(student_display["department"]))
         st.metric("Gender", str(student_display["gender"]))
     with col2:
-        st.metric("CGPA", round(student_display["cgpa"], 2))
-        st.metric("Attendance (%)", round(student_display["attendance_rate"], 1))
+        st.metric("CGPA", round(as_float(student_display["cgpa"]), 2))
+        st.metric("Attendance (%)", round(as_float(student_display["attendance_rate"]), 1))
     with col3:
         st.metric("Age", int(student_display["age"]))
         st.metric("Family Income", f"₹{int(student_display['family_income']):,}")
@@ -178,36 +306,42 @@ if menu == "📊 Dashboard":
 
     # === Risk Meter ===
     st.subheader("📊 Engagement Risk Meter")
-    fig = go.Figure(go.Indicator(
-        mode="gauge+number+delta",
-        value=risk_prob,
-        title={'text': "Dropout Risk (%)"},
-        gauge={
-            'axis': {'range': [0, 100]},
-            'bar': {'color': "red" if risk_prob > 60 else "orange" if risk_prob > 30 else "green"},
-            'steps': [
-                {'range': [0, 30], 'color': "lightgreen"},
-                {'range': [30, 60], 'color': "yellow"},
-                {'range': [60, 100], 'color': "salmon"}
-            ],
-        }
-    ))
-    st.plotly_chart(fig, use_container_width=True)
+    with timer("gauge"):
+        st.plotly_chart(gauge_figure(risk_prob), use_container_width=True)
+
+    # === Risk History (queried only when asked for) ===
+    if st.checkbox("📉 Show risk history", key="show_history"):
+        st.markdown("**Risk Trend (last 30 days)**")
+        try:
+            with timer("risk_trend"):
+                trend = query_history(risk_trend, int(selected_id))
+        except Exception as e:
+            st.warning(f"Risk history unavailable: {e}")
+            trend = None
+        if trend is not None and len(trend):
+            trend_fig = go.Figure(go.Scatter(x=trend["timestamp"], y=trend["risk_probability"],
+                                             mode="lines+markers", line={'color': "crimson"}))
+            trend_fig.update_layout(yaxis={'range': [0, 100], 'title': "Dropout Risk (%)"})
+            st.plotly_chart(trend_fig, use_container_width=True)
+        elif trend is not None:
+            st.info("No history recorded for this student yet.")
+
+        st.markdown(f"**🚨 Top 100 at Risk in {student_display['department']}**")
+        st.caption("Latest saved risk per student. Students appear once their record has been saved.")
+        if trend is not None:
+            try:
+                with timer("top_at_risk"):
+                    st.dataframe(query_history(top_at_risk, str(student_display["department"])).round(2),
+                                 use_container_width=True, hide_index=True)
+            except Exception as e:
+                st.warning(f"Risk history unavailable: {e}")
 
     # === AI Recommendations ===
     st.subheader("🧠 AI-Generated Analysis & Recommendations")
-    if risk_prob < 30:
-        risk_level = "Low Risk"
-        causes = ["High CGPA", "Consistent attendance", "Active participation"]
-        recommendations = ["Maintain study habits", "Engage in leadership roles"]
-    elif risk_prob < 60:
-        risk_level = "Moderate Risk"
-        causes = ["Moderate CGPA", "Inconsistent attendance", "Limited activity participation"]
-        recommendations = ["Set weekly goals", "Join clubs", "Seek academic counseling"]
-    else:
-        risk_level = "High Risk"
-        causes = ["Low CGPA", "Poor attendance", "Minimal activity participation"]
-        recommendations = ["Mentorship & support", "Identify financial issues", "Personalized study plan"]
+    risk_level = cohort.level_of(selected_id)
+    default_causes, recommendations = RISK_ADVICE[risk_level]
+    with timer("explain"):
+        causes = explanation.describe(cohort.position(selected_id), student_display) or default_causes
 
     st.markdown(f"Risk Level: **{risk_level}**")
     st.markdown(f"Dropout Probability: **{round(risk_prob, 2)}%**")
@@ -221,83 +355,124 @@ if menu == "📊 Dashboard":
     # === Pie Chart ===
     st.subheader("📈 Academic & Activity Performance Overview")
     labels = ["CGPA", "Attendance", "Assignments", "Projects", "Activities"]
-    values = [
-        student_display["cgpa"],
-        student_display["attendance_rate"],
-        student_display["assignments_submitted"],
-        student_display["projects_completed"],
-        student_display["total_activities"]
-    ]
-    fig2 = go.Figure(data=[go.Pie(labels=labels, values=values, hole=.4)])
-    st.plotly_chart(fig2, use_container_width=True)
-
-    # === PDF Report ===
-    st.subheader("📄 Download Student Report")
+    values = [as_float(student_display[col]) for col in
+              ("cgpa", "attendance_rate", "assignments_submitted", "projects_completed", "total_activities")]
+    with timer("pie"):
+        st.plotly_chart(pie_figure(labels, values), use_container_width=True)
 
-    def generate_pdf(student_display, risk_prob, risk_level, causes, recommendations):
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer)
-        styles = getSampleStyleSheet()
-        story = []
-
-        story.append(Paragraph("STUDENT ENGAGEMENT REPORT", styles['Title']))
-        story.append(Spacer(1, 12))
-        story.append(Paragraph("<b>Student Profile Overview</b>", styles['Heading2']))
-        for key in ["student_id","gender","department","cgpa","attendance_rate","family_income","age","scholarship","sports_participation","extra_curricular","parental_education"]:
-            story.append(Paragraph(f"{key.replace('_',' ').title()}: {student_display[key]}", styles['Normal']))
-        story.append(Spacer(1, 12))
-        story.append(Paragraph("<b>Risk Assessment Summary</b>", styles['Heading2']))
-        story.append(Paragraph(f"Dropout Probability: {round(risk_prob, 2)}%", styles['Normal']))
-        story.append(Paragraph(f"Risk Level: {risk_level}", styles['Normal']))
-        story.append(Spacer(1, 12))
-        story.append(Paragraph("<b>Identified Causes of Risk</b>", styles['Heading2']))
-        for c in causes:
-            story.append(Paragraph(f"• {c}", styles['Normal']))
-        story.append(Spacer(1, 12))
-        story.append(Paragraph("<b>Recommendations and Improvement Plan</b>", styles['Heading2']))
-        for r in recommendations:
-            story.append(Paragraph(f"• {r}", styles['Normal']))
-        story.append(Spacer(1, 24))
-        story.append(Paragraph("Generated by AI-Powered Student Engagement System", styles['Italic']))
-        doc.build(story)
-        buffer.seek(0)
-        return buffer
-
-    pdf_buffer = generate_pdf(student_display, risk_prob, risk_level, causes, recommendations)
-    st.download_button(
-        label="⬇ Download Engagement Report (PDF)",
-        data=pdf_buffer,
-        file_name=f"Student_{int(student_display['student_id'])}_Report.pdf",
-        mime="application/pdf"
-    )
+    # === PDF Report (built only when requested) ===
+    st.subheader("📄 Download Student Report")
+    if st.button("📝 Prepare PDF Report"):
+        with timer("pdf"):
+            pdf_buffer = generate_pdf(student_display, risk_prob, risk_level, causes, recommendations)
+        st.session_state.pdf_report = (selected_id, pdf_buffer.getvalue())
+
+    pdf_report = st.session_state.get("pdf_report")
+    if pdf_report is not None and pdf_report[0] == selected_id:
+        st.download_button(
+            label="⬇ Download Engagement Report (PDF)",
+            data=pdf_report[1],
+            file_name=report_filename(selected_id),
+            mime="application/pdf"
+        )
+
+    # === Bulk Reports ===
+    with st.expander("📦 Bulk Reports for a Cohort"):
+        departments = st.multiselect("Department", sorted(df_display["department"].astype(str).unique()))
+        levels = st.multiselect("Risk Band", list(RISK_ADVICE))
+        if st.button("🗜️ Build ZIP"):
+            try:
+                with timer("bulk_zip"), st.spinner("Rendering reports..."):
+                    count, zip_bytes = build_cohort_zip(departments, levels)
+                st.session_state.bulk_reports = zip_bytes
+                st.success(f"✅ {count} reports ready.")
+            except RuntimeError as e:
+                st.error(f"Bulk report failed: {e}")
+        if "bulk_reports" in st.session_state:
+            st.download_button(
+                label="⬇ Download Reports (ZIP)",
+                data=st.session_state.bulk_reports,
+                file_name="Student_Reports.zip",
+                mime="application/zip"
+            )
 
 
 # ===============================
 # 🧮 SIMULATION PANEL
 # ===============================
 if menu == "🧮 Simulation Panel":
+    import plotly.graph_objects as go
+
     st.title("🧮 Engagement Simulation Panel")
     st.write("Adjust parameters to simulate a student's predicted dropout risk.")
 
-    selected_id = st.session_state.get("selected_id", df_display["student_id"].iloc[0])
-    student_display = df_display[df_display["student_id"] == selected_id].iloc[0]
+    selected_id = st.session_state.get("selected_id", cohort.sorted_ids[0])
+    student_display = cohort.row(df_display, selected_id)
 
     attendance = st.slider("📆 Attendance (%)", 0, 100, int(student_display["attendance_rate"]))
-    cgpa = st.slider("🧾 CGPA (0–10)", 0.0, 10.0, float(student_display["cgpa"]), 0.1)
+    cgpa = st.slider("🧾 CGPA (0–10)", 0.0, 10.0, as_float(student_display["cgpa"]), 0.1)
 
-    risk_sim = simulate_risk(attendance, cgpa)
+    risk_sim = simulate_risk(selected_id, attendance, cgpa)
     st.markdown(f"### 🔮 Predicted Dropout Risk: {risk_sim:.2f}%")
 
-    fig, ax = plt.subplots(figsize=(6, 0.4))
-    color = plt.cm.RdYlGn_r(risk_sim / 100)
-    ax.barh(0, risk_sim, color=color)
-    ax.set_xlim(0, 100)
-    ax.set_yticks([])
-    ax.set_xlabel("Dropout Risk (%)")
-    st.pyplot(fig)
+    with timer("risk_bar"):
+        st.image(risk_bar_png(risk_sim, xlabel="Dropout Risk (%)"), use_container_width=True)
+
+    st.subheader("🗺️ Risk Surface (Attendance × CGPA)")
+    surface_fig = go.Figure(go.Heatmap(
+        x=CGPA_GRID, y=ATTENDANCE_GRID, z=student_surface(selected_id),
+        zmin=0, zmax=100, colorscale="RdYlGn_r", colorbar={'title': "Risk (%)"}
+    ))
+    surface_fig.add_trace(go.Scatter(
+        x=[cgpa], y=[attendance], mode="markers",
+        marker={'color': "black", 'size': 10, 'symbol': "x"}, name="Current"
+    ))
+    surface_fig.update_layout(xaxis_title="CGPA", yaxis_title="Attendance (%)")
+    with timer("surface_chart"):
+        st.plotly_chart(surface_fig, use_container_width=True)
     st.success("Move sliders to simulate different outcomes.")
 
 
+# ===============================
+# 🏫 COHORT ANALYTICS PANEL
+# ===============================
+if menu == "🏫 Cohort Analytics":
+    import plotly.graph_objects as go
+
+    st.title("🏫 Cohort Risk Analytics")
+    aggregates = cohort_aggregates()
+
+    dim = st.selectbox("Group by", list(DIMENSIONS), format_func=DIMENSIONS.get)
+    table = aggregates.table(dim)
+    label = DIMENSIONS[dim]
+    st.dataframe(table.round(2), use_container_width=True, hide_index=True)
+
+    band_colors = {"Low Risk": "lightgreen", "Moderate Risk": "gold", "High Risk": "salmon"}
+    bands_fig = go.Figure([
+        go.Bar(name=level, x=table[label], y=table[level], marker_color=band_colors[level])
+        for level in RISK_LEVELS
+    ])
+    bands_fig.update_layout(barmode="stack", xaxis_title=label, yaxis_title="Students")
+    st.plotly_chart(bands_fig, use_container_width=True)
+
+    # === Drill-down ===
+    st.subheader("🔎 Drill Down")
+    col1, col2 = st.columns(2)
+    group = col1.selectbox(label, table[label])
+    level = col2.selectbox("Risk Band", ["All"] + RISK_LEVELS)
+
+    hist = aggregates.histogram(dim, group)
+    hist_fig = go.Figure(go.Bar(x=hist.index, y=hist.values, marker_color="steelblue"))
+    hist_fig.update_layout(xaxis_title="Dropout Risk (%)", yaxis_title="Students", bargap=0.05)
+    st.plotly_chart(hist_fig, use_container_width=True)
+
+    members = aggregates.members(dim, group, None if level == "All" else level, limit=500)
+    st.dataframe(members.round(2), use_container_width=True, hide_index=True)
+    if len(members):
+        pick = st.selectbox("Student", members["student_id"])
+        st.button("📊 Open in Dashboard", on_click=open_in_dashboard, args=(pick,))
+
+
 # ===============================
 # 💬 Chatbot Section
 # ===============================
@@ -309,33 +484,10 @@ if "chat_history" not in st.session_state:
 
 user_input = st.text_input("💭 Ask the chatbot for guidance or platform help:")
 
-motivational_quotes = [
-    "Every expert was once a beginner. Keep going!",
-    "Consistency beats intensity — study a little every day.",
-    "Your effort today is your success tomorrow.",
-    "Believe you can, and you're halfway there."
-]
-
-academic_tips = [
-    "Try scheduling short, focused study sessions (Pomodoro method).",
-    "Join a peer study group or discussion circle.",
-    "Focus on weak areas first — use your risk report to guide priorities.",
-    "Ask your mentor for weekly progress feedback."
-]
-
 if st.button("💬 Chat"):
     user_input = user_input.strip()
     if user_input:
-        if "attendance" in user_input.lower() or "absent" in user_input.lower():
-            bot_reply = "Maintaining attendance above 75% reduces dropout risk. Plan your schedule effectively."
-        elif "cgpa" in user_input.lower() or "grade" in user_input.lower():
-            bot_reply = "Improving CGPA requires consistent review and practice. Seek mentor guidance."
-        elif "motivate" in user_input.lower():
-            bot_reply = random.choice(motivational_quotes)
-        elif "study" in user_input.lower():
-            bot_reply = random.choice(academic_tips)
-        else:
-            bot_reply = "Try being specific — ask about attendance, grades, or improvement strategies."
+        bot_reply = reply_for(user_input)
 
         st.session_state.chat_history.append(("You", user_input))
         st.session_state.chat_history.append(("Bot", bot_reply))
@@ -345,3 +497,27 @@ for sender, message in st.session_state.chat_history:
         st.markdown(f"🧑‍🎓 {sender}: {message}")
     else:
         st.markdown(f"🤖 {sender}: {message}")
+
+
+# ===============================
+# 🩺 Debug Timings
+# ===============================
+rerun_timings = METRICS.end_rerun(rerun_started)
+METRICS.maybe_export(EXPORT_PATH)
+
+if METRICS.enabled and st.sidebar.checkbox("🩺 Show stage timings"):
+    st.markdown("<hr>", unsafe_allow_html=True)
+    st.markdown("## 🩺 Stage Timings")
+    st.caption("This rerun (ms)")
+    st.dataframe(pd.DataFrame(
+        {"ms": [v * 1000 for v in rerun_timings.values()]}, index=list(rerun_timings)
+    ).round(2))
+    st.caption("Since server start (ms)")
+    stats = pd.DataFrame(METRICS.snapshot()).T
+    stats[["sum", "max", "p50", "p95", "p99"]] *= 1000
+    st.dataframe(stats.round(2))
+    st.caption("Figure caches (hits, misses, size)")
+    st.write(figure_cache_info())
+    col1, col2 = st.columns(2)
+    col1.download_button("⬇ Prometheus", METRICS.to_prometheus(), "metrics.prom", "text/plain")
+    col2.download_button("⬇ JSON lines", METRICS.to_jsonl(), "metrics.jsonl", "application/json")
@@ -0,0 +1,160 @@
+# ================================================
+# 🧪 Write-Behind Buffer + Risk History Tests (mongomock)
+# ================================================
+#   python -m pytest -q test_write_buffer.py
+
+import time
+from datetime import datetime, timedelta
+
+import mongomock
+import pytest
+
+from risk_history import RiskHistory
+from write_buffer import WriteBehindBuffer
+
+
+def record(student_id, risk, timestamp="2026-10-01T12:00:00", department="CS"):
+    return {"student_id": student_id, "risk_probability": risk, "cgpa": 7.5,
+            "department": department, "timestamp": timestamp}
+
+
+@pytest.fixture
+def db():
+    return mongomock.MongoClient().db
+
+
+class FlakyCollection:
+    """Collection whose first `failures` bulk_write calls raise."""
+
+    def __init__(self, collection, failures=1):
+        self.collection = collection
+        self.failures = failures
+        self.calls = 0
+
+    def bulk_write(self, ops, ordered=True):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("mongo unreachable")
+        return self.collection.bulk_write(ops, ordered=ordered)
+
+
+class LostAckHistory(RiskHistory):
+    """Writes the first append, then fails as if the reply was lost."""
+
+    def __init__(self, collection):
+        super().__init__(collection)
+        self.calls = 0
+
+    def append(self, records):
+        self.calls += 1
+        written = super().append(records)
+        if self.calls == 1:
+            raise ConnectionError("reply lost")
+        return written
+
+
+def test_repeated_upserts_for_one_student_are_coalesced(db):
+    buffer = WriteBehindBuffer(db.risk_records, background=False)
+    for risk in (10.0, 20.0, 30.0):
+        assert buffer.submit(record(1, risk))
+    assert buffer.pending() == 1
+    assert buffer.flush() == 1
+
+    docs = list(db.risk_records.find({}, {"_id": 0}))
+    assert len(docs) == 1
+    assert docs[0]["risk_probability"] == 30.0
+
+
+def test_unchanged_record_is_skipped_by_hash(db):
+    buffer = WriteBehindBuffer(db.risk_records, background=False)
+    assert buffer.submit(record(1, 42.0, timestamp="2026-10-01T12:00:00"))
+    buffer.flush()
+    # Only the volatile timestamp differs
+    assert not buffer.submit(record(1, 42.0, timestamp="2026-10-02T08:00:00"))
+    assert buffer.pending() == 0
+    assert buffer.submit(record(1, 43.0))
+
+
+def test_background_flush_when_max_batch_is_reached(db):
+    buffer = WriteBehindBuffer(db.risk_records, max_batch=5, flush_interval=60)
+    try:
+        for sid in range(5):
+            buffer.submit(record(sid, float(sid)))
+        deadline = time.monotonic() + 5
+        while db.risk_records.count_documents({}) < 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert db.risk_records.count_documents({}) == 5
+        assert buffer.pending() == 0
+    finally:
+        buffer.close()
+
+
+def test_failed_bulk_write_requeues_the_batch(db):
+    collection = FlakyCollection(db.risk_records)
+    buffer = WriteBehindBuffer(collection, background=False)
+    buffer.submit(record(1, 10.0))
+    buffer.submit(record(2, 20.0))
+    with pytest.raises(ConnectionError):
+        buffer.flush()
+    assert buffer.pending() == 2
+
+    # A newer record queued before the retry wins over the failed one
+    buffer.submit(record(1, 15.0))
+    assert buffer.flush() == 2
+    risks = {d["student_id"]: d["risk_probability"] for d in db.risk_records.find()}
+    assert risks == {1: 15.0, 2: 20.0}
+
+
+def test_retried_flush_does_not_duplicate_history(db):
+    history = LostAckHistory(db.risk_history)
+    buffer = WriteBehindBuffer(db.risk_records, background=False, history=history)
+    buffer.submit(record(1, 10.0))
+    buffer.submit(record(2, 20.0))
+    with pytest.raises(ConnectionError):
+        buffer.flush()
+    assert buffer.pending() == 2
+
+    assert buffer.flush() == 2
+    assert db.risk_history.count_documents({}) == 2
+    assert db.risk_records.count_documents({}) == 2
+
+
+def test_top_k_ranks_latest_saved_risk_from_risk_records(db):
+    history = RiskHistory(db.risk_history, latest=db.risk_records)
+    buffer = WriteBehindBuffer(db.risk_records, background=False, history=history)
+    # Student 1 was saved long ago and has not changed since
+    buffer.submit(record(1, 70.0, timestamp="2026-01-01T09:00:00"))
+    buffer.submit(record(2, 95.0))
+    buffer.submit(record(3, 50.0))
+    buffer.submit(record(4, 99.0, department="ME"))
+    buffer.flush()
+    # Student 2's risk drops: the ranking uses the latest value, not the peak
+    buffer.submit(record(2, 10.0, timestamp="2026-10-02T12:00:00"))
+    buffer.flush()
+
+    top = history.top_k("CS", k=2)
+    assert top["student_id"].tolist() == [1, 3]
+    assert top["risk_probability"].tolist() == [70.0, 50.0]
+    assert history.top_k(k=1)["student_id"].tolist() == [4]
+    assert "department_risk" in db.risk_records.index_information()
+
+
+def test_top_k_needs_risk_records(db):
+    with pytest.raises(ValueError):
+        RiskHistory(db.risk_history).top_k("CS")
+
+
+def test_trend_returns_the_window_oldest_first(db):
+    history = RiskHistory(db.risk_history)
+    now = datetime(2026, 10, 1)
+    history.append([
+        record(1, 40.0, timestamp=now - timedelta(days=2)),
+        record(1, 60.0, timestamp=now - timedelta(days=45)),
+        record(1, 30.0, timestamp=now - timedelta(days=10)),
+        record(2, 90.0, timestamp=now - timedelta(days=1)),
+    ])
+
+    trend = history.trend(1, days=30, now=now)
+    assert trend["risk_probability"].tolist() == [30.0, 40.0]
+    assert trend["timestamp"].is_monotonic_increasing
+    assert len(history.trend(1, days=None)) == 3
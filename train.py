@@ -0,0 +1,206 @@
+# ================================================
+# 🏋️ Resumable Model Training
+# ================================================
+# Replaces the 16-combination GridSearchCV(cv=2) with successive halving
+# over warm-started forests: every candidate starts small, the better
+# half survives each round and grows more trees instead of refitting.
+# Parallelism lives in one place (the forest's n_jobs) and every
+# evaluated candidate is checkpointed, so an interrupted search resumes.
+# As GridSearchCV did, the winner is then refit on the whole training
+# split (search-fit + validation rows) before it is tested and saved.
+#
+#   python train.py --data Hackathon_Cleaned.xlsx --out rf_student_engagement_model.pkl
+
+import argparse
+import itertools
+import json
+import math
+import os
+import time
+
+import joblib
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import LabelEncoder
+
+from data_cache import replace_atomically
+from feature_schema import TARGET_COL, training_columns
+
+
+PARAM_GRID = {
+    'max_depth': [10, None],
+    'min_samples_split': [2, 5],
+    'min_samples_leaf': [1, 2],
+}
+# Trees per candidate in each halving round
+N_ESTIMATORS_SCHEDULE = (50, 150, 250)
+CHECKPOINT_PATH = os.path.join(".cache", "train_checkpoint.json")
+REPORT_PATH = os.path.join(".cache", "train_report.json")
+
+
+def fit_label_encoders(df):
+    """Label-encode every text column. Returns (encoded copy, le_dict)."""
+    df = df.copy()
+    le_dict = {}
+    for col in df.select_dtypes(include=["object", "category"]).columns:
+        le = LabelEncoder()
+        df[col] = le.fit_transform(df[col].astype(str))
+        le_dict[col] = le
+    return df, le_dict
+
+
+def candidate_grid(param_grid=PARAM_GRID):
+    keys = sorted(param_grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(param_grid[k] for k in keys))]
+
+
+def _load_checkpoint(path, config):
+    if path and os.path.exists(path):
+        with open(path) as fh:
+            state = json.load(fh)
+        if state.get("config") == config:
+            return state
+    return {"config": config, "results": []}
+
+
+def _save_checkpoint(path, state):
+    if not path:
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def write(tmp_path):
+        with open(tmp_path, "w") as fh:
+            json.dump(state, fh, indent=2)
+    replace_atomically(path, write)
+
+
+def _grow(forest, params, n_estimators, X, y, n_jobs, random_state):
+    """Warm-start a candidate's forest up to n_estimators trees.
+
+    Growing 50 -> 150 trees gives the same forest as fitting 150 at once
+    with the same random_state, so a resumed run loses no accuracy.
+    """
+    if forest is None:
+        forest = RandomForestClassifier(
+            warm_start=True, random_state=random_state, n_jobs=n_jobs, **params
+        )
+    forest.set_params(n_estimators=n_estimators)
+    forest.fit(X, y)
+    return forest
+
+
+def successive_halving(X_fit, y_fit, X_val, y_val, schedule=N_ESTIMATORS_SCHEDULE,
+                       param_grid=PARAM_GRID, checkpoint_path=CHECKPOINT_PATH,
+                       n_jobs=-1, random_state=42, log=print):
+    """Pick the best parameters; returns (params, forest, results). forest is
+    the winner as fitted on X_fit, or None if it only exists in the checkpoint."""
+    candidates = candidate_grid(param_grid)
+    config = {
+        "schedule": list(schedule), "param_grid": {k: list(v) for k, v in param_grid.items()},
+        "n_fit": int(len(X_fit)), "n_val": int(len(X_val)), "random_state": random_state,
+        "features": list(X_fit.columns),
+    }
+    state = _load_checkpoint(checkpoint_path, config)
+    done = {(r["round"], r["candidate"]): r for r in state["results"]}
+    if done:
+        log(f"Resuming from checkpoint with {len(done)} evaluated candidates")
+
+    forests = {}
+    survivors = list(range(len(candidates)))
+    for rnd, n_estimators in enumerate(schedule):
+        scores = {}
+        for cid in survivors:
+            if (rnd, cid) in done:
+                scores[cid] = done[(rnd, cid)]["accuracy"]
+                continue
+            start = time.perf_counter()
+            forests[cid] = _grow(forests.get(cid), candidates[cid], n_estimators,
+                                 X_fit, y_fit, n_jobs, random_state)
+            acc = accuracy_score(y_val, forests[cid].predict(X_val))
+            result = {
+                "round": rnd, "candidate": cid, "params": candidates[cid],
+                "n_estimators": n_estimators, "accuracy": acc,
+                "wall_time_s": time.perf_counter() - start,
+            }
+            state["results"].append(result)
+            _save_checkpoint(checkpoint_path, state)
+            scores[cid] = acc
+            log(f"round {rnd} | {n_estimators} trees | {candidates[cid]} | "
+                f"acc {acc * 100:.2f}% | {result['wall_time_s']:.1f}s")
+
+        # Keep the better half (ties go to the earlier candidate)
+        ranked = sorted(survivors, key=lambda c: (-scores[c], c))
+        keep = 1 if rnd == len(schedule) - 1 else math.ceil(len(ranked) / 2)
+        for cid in ranked[keep:]:
+            forests.pop(cid, None)
+        survivors = ranked[:keep]
+
+    best = survivors[0]
+    return candidates[best], forests.get(best), state["results"]
+
+
+def train_model(df, checkpoint_path=CHECKPOINT_PATH, n_jobs=-1, random_state=42, log=print):
+    """Encode, search and evaluate. Returns (model, le_dict, report)."""
+    start = time.perf_counter()
+    df_encoded, le_dict = fit_label_encoders(df)
+    X = df_encoded[training_columns(df_encoded)]
+    y = df_encoded[TARGET_COL]
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=random_state)
+    X_fit, X_val, y_fit, y_val = train_test_split(X_train, y_train, test_size=0.25, random_state=random_state)
+
+    params, search_forest, results = successive_halving(
+        X_fit, y_fit, X_val, y_val, checkpoint_path=checkpoint_path,
+        n_jobs=n_jobs, random_state=random_state, log=log,
+    )
+    n_estimators = N_ESTIMATORS_SCHEDULE[-1] if search_forest is None else search_forest.n_estimators
+
+    # The search only saw 75% of the training split; refit the winner on all of it
+    refit_start = time.perf_counter()
+    model = _grow(None, params, n_estimators, X_train, y_train, n_jobs, random_state)
+    model.set_params(warm_start=False)
+    log(f"Refit {params} with {n_estimators} trees on {len(X_train):,} rows | "
+        f"{time.perf_counter() - refit_start:.1f}s")
+    # Search finished; a fresh run must not reuse these scores
+    if checkpoint_path and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    acc = accuracy_score(y_test, model.predict(X_test))
+    report = {
+        "best_params": params,
+        "n_estimators": model.n_estimators,
+        "n_train": int(len(X_train)),
+        "test_accuracy": acc,
+        "total_wall_time_s": time.perf_counter() - start,
+        "candidates": results,
+    }
+    log(f"Best {params} with {model.n_estimators} trees | test accuracy {acc * 100:.2f}%")
+    return model, le_dict, report
+
+
+def main(argv=None):
+    from data_cache import load_dataset
+
+    parser = argparse.ArgumentParser(description="Train the dropout-risk forest outside Streamlit.")
+    parser.add_argument("--data", default="Hackathon_Cleaned.xlsx")
+    parser.add_argument("--out", default="rf_student_engagement_model.pkl")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PATH)
+    parser.add_argument("--report", default=REPORT_PATH)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--random-state", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    df = load_dataset(args.data)
+    model, le_dict, report = train_model(
+        df, checkpoint_path=args.checkpoint, n_jobs=args.n_jobs, random_state=args.random_state
+    )
+    joblib.dump((model, le_dict), args.out)
+    os.makedirs(os.path.dirname(args.report) or ".", exist_ok=True)
+    with open(args.report, "w") as fh:
+        json.dump(report, fh, indent=2, default=str)
+    print(f"Saved model to {args.out} and report to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
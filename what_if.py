@@ -0,0 +1,69 @@
+# ================================================
+# 🧮 What-If Risk Surface
+# ================================================
+# Predicts the whole attendance (0-100) x CGPA (0-10, step 0.1) grid for
+# one student in a single predict_proba call. Surfaces are kept in a
+# small LRU cache, so moving a slider is just an array lookup.
+
+from collections import OrderedDict
+import threading
+
+import numpy as np
+import pandas as pd
+
+from feature_schema import UNSEEN, FeatureSchema
+from scoring import predict_risk
+
+
+ATTENDANCE_GRID = np.arange(0, 101, dtype=float)
+CGPA_GRID = np.arange(0, 101, dtype=float) / 10
+
+
+def risk_surface(model, le_dict, base_row, unseen=UNSEEN, schema=None):
+    """Risk (%) for every grid point, shape (len(ATTENDANCE_GRID), len(CGPA_GRID))."""
+    schema = schema or FeatureSchema.from_model(model, le_dict, unseen=unseen)
+    base = schema.row(base_row)
+
+    n_att, n_cgpa = len(ATTENDANCE_GRID), len(CGPA_GRID)
+    grid = pd.DataFrame(np.repeat(base, n_att * n_cgpa, axis=0), columns=schema.columns)
+    att, cgpa = np.meshgrid(ATTENDANCE_GRID, CGPA_GRID, indexing="ij")
+    grid["attendance_rate"] = att.ravel()
+    grid["cgpa"] = cgpa.ravel()
+    return predict_risk(model, grid).reshape(n_att, n_cgpa)
+
+
+def grid_position(attendance, cgpa):
+    """Nearest grid cell for a slider position."""
+    i = int(np.clip(round(float(attendance)), 0, len(ATTENDANCE_GRID) - 1))
+    j = int(np.clip(round(float(cgpa) * 10), 0, len(CGPA_GRID) - 1))
+    return i, j
+
+
+class RiskSurfaceEngine:
+    """LRU cache of per-student risk surfaces."""
+
+    def __init__(self, model, le_dict, maxsize=64, unseen=UNSEEN):
+        self.model = model
+        self.le_dict = le_dict
+        self.maxsize = maxsize
+        self.schema = FeatureSchema.from_model(model, le_dict, unseen=unseen)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def surface(self, key, base_row):
+        """Surface for `key` (e.g. student_id), computed from base_row on a miss."""
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        surface = risk_surface(self.model, self.le_dict, base_row, schema=self.schema)
+        with self._lock:
+            self._cache[key] = surface
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return surface
+
+    def risk(self, key, base_row, attendance, cgpa):
+        i, j = grid_position(attendance, cgpa)
+        return float(self.surface(key, base_row)[i, j])
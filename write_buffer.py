@@ -0,0 +1,108 @@
+# ================================================
+# 🗄️ Write-Behind Buffer for MongoDB Upserts
+# ================================================
+# save_student_record used to run a synchronous update_one on every
+# Dashboard rerun. Records are now queued here, coalesced per
+# student_id, skipped when nothing changed, and flushed with one
+# bulk_write from a background thread. With a RiskHistory attached, every
+# flushed record is also appended to the history collection.
+
+import atexit
+import hashlib
+import json
+import threading
+
+from pymongo import UpdateOne
+
+
+# Fields that change on every save and must not count as a change
+VOLATILE_FIELDS = ("timestamp",)
+
+
+def record_hash(record):
+    """Content hash of a record, ignoring volatile fields."""
+    stable = {k: v for k, v in record.items() if k not in VOLATILE_FIELDS}
+    payload = json.dumps(stable, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class WriteBehindBuffer:
+    """Coalesces upserts per key and flushes them in batches.
+
+    Any object with a pymongo-style bulk_write works as the collection,
+    e.g. a mongomock collection or an in-process fake in tests.
+    """
+
+    def __init__(self, collection, key="student_id", max_batch=100,
+                 flush_interval=2.0, background=True, history=None):
+        self.collection = collection
+        self.history = history
+        self.key = key
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._pending = {}
+        self._hashes = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        if background:
+            self._thread = threading.Thread(target=self._run, name="mongo-write-behind", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def submit(self, record):
+        """Queue a record. Returns False when it is unchanged and skipped."""
+        digest = record_hash(record)
+        key = record[self.key]
+        with self._lock:
+            if self._hashes.get(key) == digest:
+                return False
+            self._hashes[key] = digest
+            self._pending[key] = record
+            full = len(self._pending) >= self.max_batch
+        if full:
+            self._wake.set()
+        return True
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self):
+        """Write all pending records with one bulk_write. Returns the count."""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+        ops = [UpdateOne({self.key: key}, {"$set": rec}, upsert=True) for key, rec in batch.items()]
+        try:
+            self.collection.bulk_write(ops, ordered=False)
+            if self.history is not None:
+                # Retried batches are deduplicated by the unique index
+                self.history.append(batch.values())
+        except Exception:
+            # Put the batch back unless a newer record arrived meanwhile
+            with self._lock:
+                for key, rec in batch.items():
+                    self._pending.setdefault(key, rec)
+            raise
+        return len(ops)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                # Keep the records queued and retry on the next tick
+                pass
+
+    def close(self):
+        """Stop the background thread and flush what is left."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=5)
+        self.flush()